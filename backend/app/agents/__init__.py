@@ -3,11 +3,12 @@
 from app.agents.gap_detector import GapDetectorAgent
 from app.agents.faq_generator import FAQGeneratorAgent
 from app.agents.content_analyzer import ContentAnalyzerAgent
-from app.agents.orchestrator import KnowledgeGapOrchestrator
+from app.agents.orchestrator import KnowledgeGapOrchestrator, get_orchestrator
 
 __all__ = [
     "GapDetectorAgent",
     "FAQGeneratorAgent",
     "ContentAnalyzerAgent",
     "KnowledgeGapOrchestrator",
+    "get_orchestrator",
 ]
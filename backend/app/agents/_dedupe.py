@@ -0,0 +1,112 @@
+"""Merging of duplicate search queries and support tickets before prompting.
+
+Support data repeats itself: "Reset password?" and "reset password" are the
+same question, and a popular issue is reported in many tickets. Sending each
+copy to the LLM spends prompt tokens and pushes distinct items out of the
+prompt window. Duplicates are merged into their most frequent phrasing with
+the counts summed, so frequency still informs prioritization.
+
+Lexical merging (case, punctuation and whitespace) always applies. Semantic
+clustering with the embeddings model is opt-in via settings.gap_dedupe_semantic.
+"""
+
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, TypeVar
+
+from app.core.config import settings
+from app.core.llm import get_embeddings
+from app.agents._render import Queries, Query, Ticket, Tickets
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", Query, Ticket)
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _normalize(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _ticket_text(ticket: Ticket) -> str:
+    return f"{ticket.subject}\n{ticket.description}"
+
+
+def _merge(groups: List[List[T]]) -> tuple:
+    """Collapse each group into its most frequent item, most frequent first."""
+    merged = [
+        max(group, key=lambda item: item.count)._replace(count=sum(item.count for item in group))
+        for group in groups
+    ]
+    merged.sort(key=lambda item: item.count, reverse=True)
+    return tuple(merged)
+
+
+def _group_lexically(items: Sequence[T], text: Callable[[T], str]) -> tuple:
+    groups: Dict[str, List[T]] = {}
+    for item in items:
+        groups.setdefault(_normalize(text(item)), []).append(item)
+    return _merge(list(groups.values()))
+
+
+@lru_cache(maxsize=64)
+def merge_queries(queries: Queries) -> Queries:
+    """Merge queries that differ only in case, punctuation or spacing."""
+    return _group_lexically(queries, lambda q: q.query)
+
+
+@lru_cache(maxsize=64)
+def merge_tickets(tickets: Tickets) -> Tickets:
+    """Merge tickets whose subject and description are lexically identical."""
+    return _group_lexically(tickets, _ticket_text)
+
+
+def _unit(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
+async def _cluster(items: tuple, text: Callable[[T], str]) -> tuple:
+    """Greedily cluster items whose embeddings are within the similarity threshold.
+
+    Items arrive most frequent first, so each cluster is led by its most
+    frequent phrasing and later items join the first leader they match.
+    """
+    if len(items) < 2:
+        return items
+    try:
+        vectors = await get_embeddings().aembed_documents([text(item) for item in items])
+    except Exception as e:
+        logger.warning("Semantic deduplication failed, using lexical merge only: %s", e)
+        return items
+
+    leaders: List[List[float]] = []
+    groups: List[List[T]] = []
+    for item, vector in zip(items, map(_unit, vectors)):
+        for leader, group in zip(leaders, groups):
+            if sum(a * b for a, b in zip(vector, leader)) >= settings.gap_dedupe_similarity_threshold:
+                group.append(item)
+                break
+        else:
+            leaders.append(vector)
+            groups.append([item])
+    return _merge(groups)
+
+
+async def dedupe_queries(queries: Queries) -> Queries:
+    """Merge duplicate and, if enabled, semantically similar queries."""
+    queries = merge_queries(queries)
+    if settings.gap_dedupe_semantic:
+        queries = await _cluster(queries, lambda q: q.query)
+    return queries
+
+
+async def dedupe_tickets(tickets: Tickets) -> Tickets:
+    """Merge duplicate and, if enabled, semantically similar tickets."""
+    tickets = merge_tickets(tickets)
+    if settings.gap_dedupe_semantic:
+        tickets = await _cluster(tickets, _ticket_text)
+    return tickets
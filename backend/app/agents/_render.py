@@ -0,0 +1,149 @@
+"""Cached rendering of ticket, query and document blocks for agent prompts.
+
+Agents receive their sources as lists of dicts. The freeze_* helpers convert
+them once into tuples of named tuples, which are hashable, so the render_*
+helpers can be memoized: a source set that is rendered the same way by
+several agents, or again on a repeated analysis, is only formatted once.
+The orchestrator freezes its inputs up front; agents called directly freeze
+their own. Freezing an already frozen value returns it unchanged.
+
+Long text fields are trimmed once at freeze time to the longest excerpt any
+prompt uses, so the per-prompt slices below are mostly no-ops that return
+the same string instead of allocating a copy.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Longest excerpts used by any prompt
+TICKET_TEXT_CHARS = 300
+DOCUMENT_TEXT_CHARS = 500
+
+
+class Ticket(NamedTuple):
+    subject: str
+    description: str
+    resolution: str
+    category: str
+    count: int = 1
+
+
+class Query(NamedTuple):
+    query: str
+    count: int
+
+
+class Document(NamedTuple):
+    title: str
+    content: str
+
+
+Tickets = Tuple[Ticket, ...]
+Queries = Tuple[Query, ...]
+Documents = Tuple[Document, ...]
+Feedback = Tuple[str, ...]
+
+
+def freeze_tickets(tickets: Optional[Union[Sequence[Dict[str, Any]], Tickets]]) -> Tickets:
+    if isinstance(tickets, tuple):
+        return tickets
+    return tuple(
+        Ticket(
+            subject=t.get("subject", "No subject"),
+            description=t.get("description", "")[:TICKET_TEXT_CHARS],
+            resolution=t.get("resolution", "Not provided")[:TICKET_TEXT_CHARS],
+            category=t.get("category", "Unknown"),
+        )
+        for t in tickets or ()
+    )
+
+
+def _count(value: Any) -> int:
+    # Counts come from request JSON: null, "3" or "many" are all possible
+    try:
+        return max(int(value or 1), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def freeze_queries(queries: Optional[Union[Sequence[Dict[str, Any]], Queries]]) -> Queries:
+    if isinstance(queries, tuple):
+        return queries
+    return tuple(
+        Query(query=str(q.get("query", q)), count=_count(q.get("count")))
+        for q in queries or ()
+    )
+
+
+def freeze_documents(documents: Optional[Union[Sequence[Dict[str, Any]], Documents]]) -> Documents:
+    if isinstance(documents, tuple):
+        return documents
+    return tuple(
+        Document(
+            title=d.get("title", "Untitled"),
+            content=d.get("content", "")[:DOCUMENT_TEXT_CHARS],
+        )
+        for d in documents or ()
+    )
+
+
+def freeze_feedback(feedback: Optional[Union[Sequence[Dict[str, Any]], Feedback]]) -> Feedback:
+    if isinstance(feedback, tuple):
+        return feedback
+    return tuple(str(f.get("feedback", f)) for f in feedback or ())
+
+
+def _reported(count: int) -> str:
+    return f" (reported {count} times)" if count > 1 else ""
+
+
+@lru_cache(maxsize=64)
+def render_ticket_issues(tickets: Tickets, limit: int, chars: int, with_category: bool = False) -> str:
+    """Render tickets as reported issues, for gap detection."""
+    if with_category:
+        return "\n\n".join([
+            f"Ticket: {t.subject}{_reported(t.count)}\nCategory: {t.category}\nDescription: {t.description[:chars]}"
+            for t in tickets[:limit]
+        ])
+    return "\n\n".join([
+        f"Ticket: {t.subject}{_reported(t.count)}\nDescription: {t.description[:chars]}"
+        for t in tickets[:limit]
+    ])
+
+
+@lru_cache(maxsize=64)
+def render_ticket_resolutions(tickets: Tickets, limit: int, chars: int) -> str:
+    """Render tickets as question/resolution pairs, for FAQ generation."""
+    return "\n\n".join([
+        f"Subject: {t.subject}\nQuestion: {t.description[:chars]}\nResolution: {t.resolution[:chars]}"
+        for t in tickets[:limit]
+    ])
+
+
+@lru_cache(maxsize=64)
+def render_queries(queries: Queries, limit: int, count_label: str = "count: {count}") -> str:
+    return "\n".join([
+        f"- \"{q.query}\" ({count_label.format(count=q.count)})"
+        for q in queries[:limit]
+    ])
+
+
+@lru_cache(maxsize=64)
+def render_documents(documents: Documents, limit: int, chars: int) -> str:
+    return "\n\n".join([
+        f"Title: {d.title}\nContent: {d.content[:chars]}"
+        for d in documents[:limit]
+    ])
+
+
+@lru_cache(maxsize=64)
+def render_document_summaries(documents: Documents, limit: int, chars: int) -> str:
+    return "\n".join([
+        f"- {d.title}: {d.content[:chars]}..."
+        for d in documents[:limit]
+    ])
+
+
+@lru_cache(maxsize=64)
+def render_feedback(feedback: Feedback, limit: int) -> str:
+    return "\n".join([f"- {f}" for f in feedback[:limit]])
@@ -2,9 +2,11 @@
 
 from typing import List, Dict, Any, Optional
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel, Field
-from app.core.llm import get_llm
+from pydantic import BaseModel, Field, TypeAdapter
+from app.core.llm import invoke_chain, system_message
+from app.core.llm_cache import get_cached_llm
+from app.core.parsers import OrjsonOutputParser
+from app.agents._render import freeze_documents, render_document_summaries
 
 
 class ContentQuality(BaseModel):
@@ -20,6 +22,11 @@ class ContentQuality(BaseModel):
     improvements: List[str] = Field(description="Suggested improvements")
 
 
+class QualityBatch(BaseModel):
+    """Quality assessments for a batch of content, in input order."""
+    items: List[ContentQuality] = Field(description="One assessment per content item")
+
+
 class CoverageAnalysis(BaseModel):
     """Content coverage analysis."""
     total_topics: int
@@ -51,22 +58,18 @@ class ContentAnalysisResult(BaseModel):
     summary: str = ""
 
 
-class ContentAnalyzerAgent:
-    """Agent that analyzes content quality and coverage."""
+_QUALITY_PARSER = OrjsonOutputParser(pydantic_object=ContentQuality)
+_QUALITY_BATCH_PARSER = OrjsonOutputParser(pydantic_object=QualityBatch)
+_COVERAGE_PARSER = OrjsonOutputParser(pydantic_object=CoverageAnalysis)
+_SUGGESTION_PARSER = OrjsonOutputParser(pydantic_object=ContentSuggestionOutput)
+_QUALITY_LIST_ADAPTER = TypeAdapter(List[ContentQuality])
+_QUALITY_FORMAT_INSTRUCTIONS = _QUALITY_PARSER.get_format_instructions()
+_QUALITY_BATCH_FORMAT_INSTRUCTIONS = _QUALITY_BATCH_PARSER.get_format_instructions()
+_COVERAGE_FORMAT_INSTRUCTIONS = _COVERAGE_PARSER.get_format_instructions()
+_SUGGESTION_FORMAT_INSTRUCTIONS = _SUGGESTION_PARSER.get_format_instructions()
 
-    def __init__(self):
-        self.llm = get_llm()
-        self.quality_parser = JsonOutputParser(pydantic_object=ContentQuality)
-        self.coverage_parser = JsonOutputParser(pydantic_object=CoverageAnalysis)
-        self.suggestion_parser = JsonOutputParser(pydantic_object=ContentSuggestionOutput)
-
-    async def analyze_quality(
-        self,
-        content: Dict[str, Any]
-    ) -> ContentQuality:
-        """Analyze quality of a single piece of content."""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a content quality analyst. Evaluate the given content on:
+_QUALITY_PROMPT = ChatPromptTemplate.from_messages([
+    system_message("""You are a content quality analyst. Evaluate the given content on:
 
 1. **Completeness**: Does it cover the topic thoroughly?
 2. **Clarity**: Is it easy to understand?
@@ -75,8 +78,8 @@ class ContentAnalyzerAgent:
 
 Score each dimension 0-1 and identify specific issues and improvements.
 
-{format_instructions}"""),
-            ("human", """Analyze this content:
+{format_instructions}""".format(format_instructions=_QUALITY_FORMAT_INSTRUCTIONS)),
+    ("human", """Analyze this content:
 
 Title: {title}
 Content: {content}
@@ -84,31 +87,29 @@ Last Updated: {last_updated}
 Category: {category}
 
 Provide a quality assessment.""")
-        ])
+])
 
-        chain = prompt | self.llm | self.quality_parser
-        result = await chain.ainvoke({
-            "title": content.get("title", "Untitled"),
-            "content": content.get("content", "")[:3000],
-            "last_updated": content.get("last_updated", "Unknown"),
-            "category": content.get("category", "Unknown"),
-            "format_instructions": self.quality_parser.get_format_instructions()
-        })
+_QUALITY_BATCH_PROMPT = ChatPromptTemplate.from_messages([
+    system_message("""You are a content quality analyst. Evaluate each numbered content item on:
 
-        if isinstance(result, dict):
-            result["content_id"] = content.get("id", "")
-            result["title"] = content.get("title", "Untitled")
-            return ContentQuality(**result)
-        return result
+1. **Completeness**: Does it cover the topic thoroughly?
+2. **Clarity**: Is it easy to understand?
+3. **Accuracy**: Is the information correct and current?
+4. **Freshness**: Is it up-to-date?
 
-    async def analyze_coverage(
-        self,
-        content_list: List[Dict[str, Any]],
-        expected_topics: List[str]
-    ) -> CoverageAnalysis:
-        """Analyze content coverage against expected topics."""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a content coverage analyst. Compare existing content 
+Score each dimension 0-1 and identify specific issues and improvements.
+Return exactly one assessment per item, in the same order as the input.
+
+{format_instructions}""".format(format_instructions=_QUALITY_BATCH_FORMAT_INSTRUCTIONS)),
+    ("human", """Analyze these {count} content items:
+
+{contents}
+
+Provide a quality assessment for each item.""")
+])
+
+_COVERAGE_PROMPT = ChatPromptTemplate.from_messages([
+    system_message("""You are a content coverage analyst. Compare existing content 
 against expected topics to identify gaps.
 
 For each expected topic, determine if it is:
@@ -118,8 +119,8 @@ For each expected topic, determine if it is:
 
 Provide actionable recommendations for improving coverage.
 
-{format_instructions}"""),
-            ("human", """Analyze coverage:
+{format_instructions}""".format(format_instructions=_COVERAGE_FORMAT_INSTRUCTIONS)),
+    ("human", """Analyze coverage:
 
 ## Existing Content
 {existing_content}
@@ -128,33 +129,10 @@ Provide actionable recommendations for improving coverage.
 {expected_topics}
 
 Provide a coverage analysis.""")
-        ])
-
-        content_summary = "\n".join([
-            f"- {c.get('title', 'Untitled')}: {c.get('content', '')[:200]}..."
-            for c in content_list[:30]
-        ])
-
-        chain = prompt | self.llm | self.coverage_parser
-        result = await chain.ainvoke({
-            "existing_content": content_summary,
-            "expected_topics": "\n".join([f"- {t}" for t in expected_topics]),
-            "format_instructions": self.coverage_parser.get_format_instructions()
-        })
-
-        if isinstance(result, dict):
-            return CoverageAnalysis(**result)
-        return result
+])
 
-    async def suggest_content(
-        self,
-        gap_title: str,
-        gap_description: str,
-        existing_content: List[str] = None
-    ) -> ContentSuggestionOutput:
-        """Generate content suggestion for a gap."""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a content strategist. Create a detailed content 
+_SUGGESTION_PROMPT = ChatPromptTemplate.from_messages([
+    system_message("""You are a content strategist. Create a detailed content 
 suggestion to address a knowledge gap.
 
 Provide:
@@ -165,8 +143,8 @@ Provide:
 5. SEO keywords to target
 6. Related content to link to
 
-{format_instructions}"""),
-            ("human", """Create a content suggestion for this gap:
+{format_instructions}""".format(format_instructions=_SUGGESTION_FORMAT_INSTRUCTIONS)),
+    ("human", """Create a content suggestion for this gap:
 
 Gap Title: {gap_title}
 Gap Description: {gap_description}
@@ -175,16 +153,126 @@ Existing Related Content:
 {existing_content}
 
 Provide a comprehensive content suggestion.""")
+])
+
+
+class ContentAnalyzerAgent:
+    """Agent that analyzes content quality and coverage."""
+
+    def __init__(self):
+        self.llm = get_cached_llm()
+        self.quality_parser = _QUALITY_PARSER
+        self.quality_batch_parser = _QUALITY_BATCH_PARSER
+        self.coverage_parser = _COVERAGE_PARSER
+        self.suggestion_parser = _SUGGESTION_PARSER
+        self.quality_prompt = _QUALITY_PROMPT
+        self.quality_batch_prompt = _QUALITY_BATCH_PROMPT
+        self.coverage_prompt = _COVERAGE_PROMPT
+        self.suggestion_prompt = _SUGGESTION_PROMPT
+
+    async def analyze_quality(
+        self,
+        content: Dict[str, Any]
+    ) -> ContentQuality:
+        """Analyze quality of a single piece of content."""
+        chain = self.quality_prompt | self.llm | self.quality_parser
+        result = await invoke_chain(chain, {
+            "title": content.get("title", "Untitled"),
+            "content": content.get("content", "")[:3000],
+            "last_updated": content.get("last_updated", "Unknown"),
+            "category": content.get("category", "Unknown")
+        })
+
+        if isinstance(result, dict):
+            result["content_id"] = content.get("id", "")
+            result["title"] = content.get("title", "Untitled")
+            return ContentQuality.model_validate(result)
+        return result
+
+    async def analyze_quality_batch(
+        self,
+        contents: List[Dict[str, Any]]
+    ) -> List[ContentQuality]:
+        """Analyze quality of several pieces of content in a single LLM call.
+
+        Raises ValueError if the response does not hold exactly one
+        assessment per item, so callers can fall back to analyze_quality.
+        """
+        if not contents:
+            return []
+
+        contents_text = "\n\n".join([
+            f"### Content {i}\n"
+            f"Title: {c.get('title', 'Untitled')}\n"
+            f"Content: {c.get('content', '')[:3000]}\n"
+            f"Last Updated: {c.get('last_updated', 'Unknown')}\n"
+            f"Category: {c.get('category', 'Unknown')}"
+            for i, c in enumerate(contents, start=1)
         ])
 
-        chain = prompt | self.llm | self.suggestion_parser
-        result = await chain.ainvoke({
+        chain = self.quality_batch_prompt | self.llm | self.quality_batch_parser
+        result = await invoke_chain(chain, {
+            "count": len(contents),
+            "contents": contents_text
+        })
+
+        items = result.get("items") if isinstance(result, dict) else None
+        if not isinstance(items, list) or len(items) != len(contents):
+            raise ValueError(
+                f"Expected {len(contents)} quality assessments, got "
+                f"{len(items) if isinstance(items, list) else 'none'}"
+            )
+
+        for content, item in zip(contents, items):
+            if isinstance(item, dict):
+                item["content_id"] = content.get("id", "")
+                item["title"] = content.get("title", "Untitled")
+        return _QUALITY_LIST_ADAPTER.validate_python(items)
+
+    async def analyze_coverage(
+        self,
+        content_list: List[Dict[str, Any]],
+        expected_topics: List[str]
+    ) -> CoverageAnalysis:
+        """Analyze content coverage against expected topics."""
+        if not content_list or not expected_topics:
+            # Nothing to compare: every expected topic is uncovered
+            return CoverageAnalysis(
+                total_topics=len(expected_topics or []),
+                covered_topics=0,
+                coverage_percentage=0.0,
+                well_covered=[],
+                partially_covered=[],
+                not_covered=list(expected_topics or []),
+                recommendations=[]
+            )
+
+        content_summary = render_document_summaries(freeze_documents(content_list), 30, 200)
+
+        chain = self.coverage_prompt | self.llm | self.coverage_parser
+        result = await invoke_chain(chain, {
+            "existing_content": content_summary,
+            "expected_topics": "\n".join([f"- {t}" for t in expected_topics])
+        })
+
+        if isinstance(result, dict):
+            return CoverageAnalysis.model_validate(result)
+        return result
+
+    async def suggest_content(
+        self,
+        gap_title: str,
+        gap_description: str,
+        existing_content: List[str] = None
+    ) -> ContentSuggestionOutput:
+        """Generate content suggestion for a gap."""
+        chain = self.suggestion_prompt | self.llm | self.suggestion_parser
+        result = await invoke_chain(chain, {
             "gap_title": gap_title,
             "gap_description": gap_description,
-            "existing_content": "\n".join(existing_content[:10]) if existing_content else "No related content",
-            "format_instructions": self.suggestion_parser.get_format_instructions()
+            "existing_content": "\n".join(existing_content[:10]) if existing_content else "No related content"
         })
 
         if isinstance(result, dict):
-            return ContentSuggestionOutput(**result)
+            return ContentSuggestionOutput.model_validate(result)
         return result
@@ -1,10 +1,15 @@
 """FAQ Generator Agent - Automatically generates FAQs from support data."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
-from app.core.llm import get_llm
+from app.core.llm import invoke_chain, system_message
+from app.core.llm_cache import get_cached_llm
+from app.core.parsers import OrjsonOutputParser
+from app.agents._render import (
+    freeze_documents, freeze_queries, freeze_tickets,
+    render_documents, render_queries, render_ticket_resolutions,
+)
 
 
 class GeneratedFAQ(BaseModel):
@@ -26,15 +31,11 @@ class FAQGenerationResult(BaseModel):
     generation_summary: str = ""
 
 
-class FAQGeneratorAgent:
-    """Agent that generates FAQs from support tickets and common queries."""
-
-    def __init__(self):
-        self.llm = get_llm()
-        self.parser = JsonOutputParser(pydantic_object=FAQGenerationResult)
+_PARSER = OrjsonOutputParser(pydantic_object=FAQGenerationResult)
+_FORMAT_INSTRUCTIONS = _PARSER.get_format_instructions()
 
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert FAQ writer who creates clear, helpful FAQ content 
+_PROMPT = ChatPromptTemplate.from_messages([
+    system_message("""You are an expert FAQ writer who creates clear, helpful FAQ content 
 from support ticket data and common user questions.
 
 Your FAQs should:
@@ -55,8 +56,8 @@ Assign confidence scores based on:
 - How well the answer addresses the question
 - Completeness of the information
 
-{format_instructions}"""),
-            ("human", """Generate FAQs from the following support data:
+{format_instructions}""".format(format_instructions=_FORMAT_INSTRUCTIONS)),
+    ("human", """Generate FAQs from the following support data:
 
 ## Support Tickets
 {tickets}
@@ -68,7 +69,42 @@ Assign confidence scores based on:
 {documentation}
 
 Generate high-quality FAQs that address the most common user needs.""")
-        ])
+])
+
+_FAQ_PARSER = OrjsonOutputParser(pydantic_object=GeneratedFAQ)
+_FAQ_FORMAT_INSTRUCTIONS = _FAQ_PARSER.get_format_instructions()
+
+_IMPROVE_PROMPT = ChatPromptTemplate.from_messages([
+    system_message("""You are an expert FAQ editor. Improve the given FAQ based on feedback.
+
+Make the answer:
+- More clear and concise
+- More comprehensive where needed
+- Better structured for readability
+- More accurate based on feedback
+
+{format_instructions}""".format(format_instructions=_FAQ_FORMAT_INSTRUCTIONS)),
+    ("human", """Improve this FAQ:
+
+Question: {question}
+Current Answer: {current_answer}
+
+Feedback:
+{feedback}
+
+Provide an improved version.""")
+])
+
+
+class FAQGeneratorAgent:
+    """Agent that generates FAQs from support tickets and common queries."""
+
+    def __init__(self):
+        self.llm = get_cached_llm()
+        self.parser = _PARSER
+        self.prompt = _PROMPT
+        self.faq_parser = _FAQ_PARSER
+        self.improve_prompt = _IMPROVE_PROMPT
 
     async def generate_from_tickets(
         self,
@@ -76,25 +112,22 @@ Generate high-quality FAQs that address the most common user needs.""")
         existing_docs: List[str] = None
     ) -> FAQGenerationResult:
         """Generate FAQs from support tickets."""
+        if not tickets:
+            return FAQGenerationResult(generation_summary="No input provided")
+
         # Group similar tickets
-        tickets_text = "\n\n".join([
-            f"Subject: {t.get('subject', 'No subject')}\n"
-            f"Question: {t.get('description', '')[:300]}\n"
-            f"Resolution: {t.get('resolution', 'Not provided')[:300]}"
-            for t in tickets[:40]
-        ])
+        tickets_text = render_ticket_resolutions(freeze_tickets(tickets), 40, 300)
 
         chain = self.prompt | self.llm | self.parser
-        result = await chain.ainvoke({
+        result = await invoke_chain(chain, {
             "tickets": tickets_text or "No ticket data available",
             "queries": "No query data provided",
-            "documentation": "\n".join(existing_docs[:10]) if existing_docs else "No existing documentation",
-            "format_instructions": self.parser.get_format_instructions()
+            "documentation": "\n".join(existing_docs[:10]) if existing_docs else "No existing documentation"
         })
 
         if isinstance(result, dict):
             result["total_sources_analyzed"] = len(tickets)
-            return FAQGenerationResult(**result)
+            return FAQGenerationResult.model_validate(result)
         return result
 
     async def generate_from_queries(
@@ -103,30 +136,22 @@ Generate high-quality FAQs that address the most common user needs.""")
         documentation: List[Dict[str, Any]] = None
     ) -> FAQGenerationResult:
         """Generate FAQs from common search queries."""
-        queries_text = "\n".join([
-            f"- \"{q.get('query', q)}\" (asked {q.get('count', 1)} times)"
-            for q in queries[:50]
-        ])
-
-        docs_text = ""
-        if documentation:
-            docs_text = "\n\n".join([
-                f"Title: {d.get('title', 'Untitled')}\n"
-                f"Content: {d.get('content', '')[:500]}"
-                for d in documentation[:10]
-            ])
+        if not queries:
+            return FAQGenerationResult(generation_summary="No input provided")
+
+        queries_text = render_queries(freeze_queries(queries), 50, "asked {count} times")
+        docs_text = render_documents(freeze_documents(documentation), 10, 500)
 
         chain = self.prompt | self.llm | self.parser
-        result = await chain.ainvoke({
+        result = await invoke_chain(chain, {
             "tickets": "No ticket data provided",
             "queries": queries_text or "No query data available",
-            "documentation": docs_text or "No existing documentation",
-            "format_instructions": self.parser.get_format_instructions()
+            "documentation": docs_text or "No existing documentation"
         })
 
         if isinstance(result, dict):
             result["total_sources_analyzed"] = len(queries)
-            return FAQGenerationResult(**result)
+            return FAQGenerationResult.model_validate(result)
         return result
 
     async def generate(
@@ -136,41 +161,23 @@ Generate high-quality FAQs that address the most common user needs.""")
         documentation: List[Dict[str, Any]] = None
     ) -> FAQGenerationResult:
         """Generate FAQs from all available sources."""
-        tickets_text = ""
-        if tickets:
-            tickets_text = "\n\n".join([
-                f"Subject: {t.get('subject', 'No subject')}\n"
-                f"Question: {t.get('description', '')[:250]}\n"
-                f"Resolution: {t.get('resolution', 'Not provided')[:250]}"
-                for t in tickets[:30]
-            ])
-
-        queries_text = ""
-        if queries:
-            queries_text = "\n".join([
-                f"- \"{q.get('query', q)}\" (count: {q.get('count', 1)})"
-                for q in queries[:40]
-            ])
-
-        docs_text = ""
-        if documentation:
-            docs_text = "\n\n".join([
-                f"Title: {d.get('title', 'Untitled')}\n"
-                f"Content: {d.get('content', '')[:400]}"
-                for d in documentation[:10]
-            ])
+        if not (tickets or queries or documentation):
+            return FAQGenerationResult(generation_summary="No input provided")
+
+        tickets_text = render_ticket_resolutions(freeze_tickets(tickets), 30, 250)
+        queries_text = render_queries(freeze_queries(queries), 40)
+        docs_text = render_documents(freeze_documents(documentation), 10, 400)
 
         chain = self.prompt | self.llm | self.parser
-        result = await chain.ainvoke({
+        result = await invoke_chain(chain, {
             "tickets": tickets_text or "No ticket data available",
             "queries": queries_text or "No query data available",
-            "documentation": docs_text or "No existing documentation",
-            "format_instructions": self.parser.get_format_instructions()
+            "documentation": docs_text or "No existing documentation"
         })
 
         if isinstance(result, dict):
             result["total_sources_analyzed"] = (len(tickets) if tickets else 0) + (len(queries) if queries else 0)
-            return FAQGenerationResult(**result)
+            return FAQGenerationResult.model_validate(result)
         return result
 
     async def improve_faq(
@@ -180,37 +187,14 @@ Generate high-quality FAQs that address the most common user needs.""")
         feedback: List[str] = None
     ) -> GeneratedFAQ:
         """Improve an existing FAQ based on feedback."""
-        improve_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert FAQ editor. Improve the given FAQ based on feedback.
-
-Make the answer:
-- More clear and concise
-- More comprehensive where needed
-- Better structured for readability
-- More accurate based on feedback
-
-{format_instructions}"""),
-            ("human", """Improve this FAQ:
-
-Question: {question}
-Current Answer: {current_answer}
-
-Feedback:
-{feedback}
-
-Provide an improved version.""")
-        ])
-
-        single_parser = JsonOutputParser(pydantic_object=GeneratedFAQ)
-        chain = improve_prompt | self.llm | single_parser
+        chain = self.improve_prompt | self.llm | self.faq_parser
 
-        result = await chain.ainvoke({
+        result = await invoke_chain(chain, {
             "question": question,
             "current_answer": current_answer,
-            "feedback": "\n".join(feedback) if feedback else "No specific feedback",
-            "format_instructions": single_parser.get_format_instructions()
+            "feedback": "\n".join(feedback) if feedback else "No specific feedback"
         })
 
         if isinstance(result, dict):
-            return GeneratedFAQ(**result)
+            return GeneratedFAQ.model_validate(result)
         return result
@@ -1,11 +1,22 @@
 """Gap Detector Agent - Identifies knowledge gaps from various sources."""
 
-from typing import List, Dict, Any, Optional
-import json
+import asyncio
+from typing import List, Dict, Any, Optional, Callable, Set
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from pydantic import BaseModel, Field
-from app.core.llm import get_llm
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from app.core.llm import invoke_chain, stream_chain, system_message
+from app.core.llm_cache import get_cached_llm
+from app.core.parsers import OrjsonOutputParser
+from app.core.retry import llm_retrying
+from app.models.gap import GapPriority
+from app.agents._dedupe import dedupe_queries, dedupe_tickets
+from app.agents._render import (
+    freeze_feedback, freeze_queries, freeze_tickets,
+    render_feedback, render_queries, render_ticket_issues,
+)
+
+
+_PRIORITIES = {priority.value: priority for priority in GapPriority}
 
 
 class DetectedGap(BaseModel):
@@ -13,12 +24,18 @@ class DetectedGap(BaseModel):
     title: str = Field(description="Short title for the gap")
     description: str = Field(description="Detailed description of what's missing")
     topic: str = Field(description="Topic category")
-    priority: str = Field(description="Priority: critical, high, medium, low")
+    priority: GapPriority = Field(description="Priority: critical, high, medium, low")
     evidence: List[str] = Field(description="Supporting evidence")
     search_queries: List[str] = Field(description="Related search queries")
     impact_score: float = Field(description="Impact score 0-1")
     suggested_content: str = Field(description="Brief outline of suggested content")
 
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _normalize_priority(cls, value):
+        # Priorities are stored in an enum column; treat unknown ones as medium
+        return _PRIORITIES.get(str(value).strip().lower(), GapPriority.MEDIUM)
+
 
 class GapDetectionResult(BaseModel):
     """Result of gap detection analysis."""
@@ -29,15 +46,11 @@ class GapDetectionResult(BaseModel):
     coverage_score: float = 0.0
 
 
-class GapDetectorAgent:
-    """Agent that detects knowledge gaps from search queries and support tickets."""
+_PARSER = OrjsonOutputParser(pydantic_object=GapDetectionResult)
+_FORMAT_INSTRUCTIONS = _PARSER.get_format_instructions()
 
-    def __init__(self):
-        self.llm = get_llm()
-        self.parser = JsonOutputParser(pydantic_object=GapDetectionResult)
-
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert knowledge base analyst specializing in identifying 
+_PROMPT = ChatPromptTemplate.from_messages([
+    system_message("""You are an expert knowledge base analyst specializing in identifying 
 gaps in documentation and support content.
 
 Your job is to analyze:
@@ -58,8 +71,8 @@ Prioritize gaps that:
 - Relate to core product features
 - Have easy-to-create solutions
 
-{format_instructions}"""),
-            ("human", """Analyze the following data to identify knowledge gaps:
+{format_instructions}""".format(format_instructions=_FORMAT_INSTRUCTIONS)),
+    ("human", """Analyze the following data to identify knowledge gaps:
 
 ## Zero-Result Search Queries
 {search_queries}
@@ -74,7 +87,16 @@ Prioritize gaps that:
 {existing_content}
 
 Identify all knowledge gaps and prioritize them.""")
-        ])
+])
+
+
+class GapDetectorAgent:
+    """Agent that detects knowledge gaps from search queries and support tickets."""
+
+    def __init__(self):
+        self.llm = get_cached_llm()
+        self.parser = _PARSER
+        self.prompt = _PROMPT
 
     async def detect_from_searches(
         self,
@@ -82,23 +104,22 @@ Identify all knowledge gaps and prioritize them.""")
         existing_content: List[str] = None
     ) -> GapDetectionResult:
         """Detect gaps from search queries with no results."""
-        queries_text = "\n".join([
-            f"- \"{q.get('query', q)}\" (count: {q.get('count', 1)})"
-            for q in zero_result_queries[:50]
-        ])
+        if not zero_result_queries:
+            return GapDetectionResult(analysis_summary="No input provided")
+
+        queries_text = render_queries(await dedupe_queries(freeze_queries(zero_result_queries)), 50)
 
         chain = self.prompt | self.llm | self.parser
-        result = await chain.ainvoke({
+        result = await invoke_chain(chain, {
             "search_queries": queries_text or "No search data available",
             "support_tickets": "No ticket data provided",
             "user_feedback": "No feedback data provided",
-            "existing_content": "\n".join(existing_content[:20]) if existing_content else "No existing content provided",
-            "format_instructions": self.parser.get_format_instructions()
+            "existing_content": "\n".join(existing_content[:20]) if existing_content else "No existing content provided"
         })
 
         if isinstance(result, dict):
             result["total_queries_analyzed"] = len(zero_result_queries)
-            return GapDetectionResult(**result)
+            return GapDetectionResult.model_validate(result)
         return result
 
     async def detect_from_tickets(
@@ -107,25 +128,23 @@ Identify all knowledge gaps and prioritize them.""")
         existing_content: List[str] = None
     ) -> GapDetectionResult:
         """Detect gaps from support tickets."""
-        tickets_text = "\n\n".join([
-            f"Ticket: {t.get('subject', 'No subject')}\n"
-            f"Category: {t.get('category', 'Unknown')}\n"
-            f"Description: {t.get('description', '')[:300]}"
-            for t in support_tickets[:30]
-        ])
+        if not support_tickets:
+            return GapDetectionResult(analysis_summary="No input provided")
+
+        tickets = await dedupe_tickets(freeze_tickets(support_tickets))
+        tickets_text = render_ticket_issues(tickets, 30, 300, with_category=True)
 
         chain = self.prompt | self.llm | self.parser
-        result = await chain.ainvoke({
+        result = await invoke_chain(chain, {
             "search_queries": "No search data provided",
             "support_tickets": tickets_text or "No ticket data available",
             "user_feedback": "No feedback data provided",
-            "existing_content": "\n".join(existing_content[:20]) if existing_content else "No existing content provided",
-            "format_instructions": self.parser.get_format_instructions()
+            "existing_content": "\n".join(existing_content[:20]) if existing_content else "No existing content provided"
         })
 
         if isinstance(result, dict):
             result["total_tickets_analyzed"] = len(support_tickets)
-            return GapDetectionResult(**result)
+            return GapDetectionResult.model_validate(result)
         return result
 
     async def detect(
@@ -133,42 +152,99 @@ Identify all knowledge gaps and prioritize them.""")
         search_queries: List[Dict[str, Any]] = None,
         support_tickets: List[Dict[str, Any]] = None,
         user_feedback: List[Dict[str, Any]] = None,
-        existing_content: List[str] = None
+        existing_content: List[str] = None,
+        on_gap: Optional[Callable[[DetectedGap], None]] = None,
+        on_restart: Optional[Callable[[], None]] = None
     ) -> GapDetectionResult:
-        """Detect gaps from all available sources."""
-        queries_text = ""
-        if search_queries:
-            queries_text = "\n".join([
-                f"- \"{q.get('query', q)}\" (count: {q.get('count', 1)})"
-                for q in search_queries[:50]
-            ])
-
-        tickets_text = ""
-        if support_tickets:
-            tickets_text = "\n\n".join([
-                f"Ticket: {t.get('subject', 'No subject')}\n"
-                f"Description: {t.get('description', '')[:200]}"
-                for t in support_tickets[:30]
-            ])
-
-        feedback_text = ""
-        if user_feedback:
-            feedback_text = "\n".join([
-                f"- {f.get('feedback', f)}"
-                for f in user_feedback[:20]
-            ])
+        """Detect gaps from all available sources.
+
+        If on_gap is given, the response is streamed and on_gap is called with
+        each gap as soon as it is complete, before generation has finished.
+        If the stream is retried after gaps were reported, on_restart is
+        called first: those gaps may not be in the final result.
+        """
+        if not (search_queries or support_tickets or user_feedback):
+            return GapDetectionResult(analysis_summary="No input provided")
+
+        queries, tickets = await asyncio.gather(
+            dedupe_queries(freeze_queries(search_queries)),
+            dedupe_tickets(freeze_tickets(support_tickets)),
+        )
+        queries_text = render_queries(queries, 50)
+        tickets_text = render_ticket_issues(tickets, 30, 200)
+        feedback_text = render_feedback(freeze_feedback(user_feedback), 20)
 
         chain = self.prompt | self.llm | self.parser
-        result = await chain.ainvoke({
+        payload = {
             "search_queries": queries_text or "No search data available",
             "support_tickets": tickets_text or "No ticket data available",
             "user_feedback": feedback_text or "No feedback data available",
-            "existing_content": "\n".join(existing_content[:20]) if existing_content else "No existing content",
-            "format_instructions": self.parser.get_format_instructions()
-        })
+            "existing_content": "\n".join(existing_content[:20]) if existing_content else "No existing content"
+        }
+        if on_gap is None:
+            result = await invoke_chain(chain, payload)
+        else:
+            result = await self._stream_gaps(chain, payload, on_gap, on_restart)
 
         if isinstance(result, dict):
             result["total_queries_analyzed"] = len(search_queries) if search_queries else 0
             result["total_tickets_analyzed"] = len(support_tickets) if support_tickets else 0
-            return GapDetectionResult(**result)
+            return GapDetectionResult.model_validate(result)
         return result
+
+    async def _stream_gaps(
+        self,
+        chain,
+        payload: Dict[str, Any],
+        on_gap: Callable[[DetectedGap], None],
+        on_restart: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """Stream a detection result, reporting gaps as they complete.
+
+        The parser yields the cumulative partial JSON on every chunk. A gap is
+        complete once the next one has started; the rest are reported when the
+        stream ends. If the stream fails transiently it is restarted; when the
+        failed attempt had reported gaps, on_restart is called and the new
+        attempt's gaps are all reported afresh.
+
+        Gaps validated while streaming replace their dicts in the result, so
+        validating the full result doesn't validate them a second time.
+        """
+        reported: Set[str] = set()
+
+        def report(gap: DetectedGap) -> None:
+            if gap.title not in reported:
+                reported.add(gap.title)
+                on_gap(gap)
+
+        async for attempt in llm_retrying():
+            with attempt:
+                if reported:
+                    reported.clear()
+                    if on_restart is not None:
+                        on_restart()
+                result: Any = None
+                validated: List[Optional[DetectedGap]] = []
+                async for partial in stream_chain(chain, payload):
+                    result = partial
+                    gaps = partial.get("gaps") if isinstance(partial, dict) else None
+                    while gaps and len(gaps) > len(validated) + 1:
+                        validated.append(self._emit_gap(gaps[len(validated)], report))
+
+        gaps = result.get("gaps") if isinstance(result, dict) else None
+        if gaps:
+            for gap in gaps[len(validated):]:
+                validated.append(self._emit_gap(gap, report))
+            for i, detected in enumerate(validated):
+                if detected is not None:
+                    gaps[i] = detected
+        return result
+
+    @staticmethod
+    def _emit_gap(gap: Any, on_gap: Callable[[DetectedGap], None]) -> Optional[DetectedGap]:
+        try:
+            detected = DetectedGap.model_validate(gap)
+        except ValidationError:
+            return None  # Surfaces when the full result is validated
+        on_gap(detected)
+        return detected
@@ -1,29 +1,42 @@
 """Knowledge Gap Orchestrator - Coordinates all agents."""
 
-from datetime import datetime
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 import uuid
 import time
 
-from app.agents.gap_detector import GapDetectorAgent, GapDetectionResult
-from app.agents.faq_generator import FAQGeneratorAgent, FAQGenerationResult
-from app.agents.content_analyzer import ContentAnalyzerAgent, ContentAnalysisResult
+from app.core.config import settings
+from app.agents.gap_detector import GapDetectorAgent, GapDetectionResult, DetectedGap
+from app.agents.faq_generator import FAQGeneratorAgent, FAQGenerationResult, GeneratedFAQ
+from app.agents.content_analyzer import ContentAnalyzerAgent, ContentAnalysisResult, ContentSuggestionOutput
+from app.agents._render import freeze_documents, freeze_feedback, freeze_queries, freeze_tickets
 
+logger = logging.getLogger(__name__)
 
+
+@dataclass(slots=True)
 class AnalysisReport:
     """Complete analysis report."""
-    def __init__(self):
-        self.id = str(uuid.uuid4())
-        self.gaps_found = 0
-        self.faqs_generated = 0
-        self.suggestions_created = 0
-        self.coverage_score = 0.0
-        self.gaps = []
-        self.faqs = []
-        self.suggestions = []
-        self.summary = ""
-        self.created_at = datetime.utcnow()
-        self.duration_seconds = 0.0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    gaps_found: int = 0
+    faqs_generated: int = 0
+    suggestions_created: int = 0
+    coverage_score: float = 0.0
+    gaps: List[DetectedGap] = field(default_factory=list)
+    faqs: List[GeneratedFAQ] = field(default_factory=list)
+    suggestions: List[ContentSuggestionOutput] = field(default_factory=list)
+    summary: str = ""
+    duration_seconds: float = 0.0
+    # Creation time as a POSIX timestamp; created_at builds the datetime on read
+    created_ts: float = field(default_factory=time.time, repr=False)
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_ts, timezone.utc)
 
 
 class KnowledgeGapOrchestrator:
@@ -46,53 +59,99 @@ class KnowledgeGapOrchestrator:
         generate_suggestions: bool = True
     ) -> AnalysisReport:
         """Run complete knowledge gap analysis."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         report = AnalysisReport()
 
-        # Step 1: Detect gaps
+        # Steps 1-3 are independent of each other, so run them concurrently
         content_titles = [c.get("title", "") for c in existing_content] if existing_content else []
-        gap_result = await self.gap_detector.detect(
+
+        # Freeze sources once so agents sharing them reuse the rendered prompt text
+        search_queries = freeze_queries(search_queries)
+        support_tickets = freeze_tickets(support_tickets)
+        user_feedback = freeze_feedback(user_feedback)
+        existing_content = freeze_documents(existing_content)
+        run_coverage = bool(expected_topics and existing_content)
+        run_faqs = bool(generate_faqs and support_tickets)
+
+        # Step 4 is pipelined with step 1: a content suggestion is requested as
+        # soon as each of the top gaps has been streamed, not after detection
+        suggestion_tasks = []
+
+        def request_suggestion(gap: DetectedGap) -> None:
+            if len(suggestion_tasks) < 5:  # Top 5 gaps
+                suggestion_tasks.append((gap, asyncio.create_task(
+                    self.content_analyzer.suggest_content(
+                        gap_title=gap.title,
+                        gap_description=gap.description,
+                        existing_content=content_titles[:10]
+                    )
+                )))
+
+        def restart_suggestions() -> None:
+            # Detection is being retried; its earlier gaps may not be in the result
+            for _, task in suggestion_tasks:
+                task.cancel()
+            suggestion_tasks.clear()
+
+        # Step 1: Detect gaps
+        tasks = [self.gap_detector.detect(
             search_queries=search_queries,
             support_tickets=support_tickets,
             user_feedback=user_feedback,
-            existing_content=content_titles
-        )
-        
-        report.gaps = gap_result.gaps
-        report.gaps_found = len(gap_result.gaps)
+            existing_content=content_titles,
+            on_gap=request_suggestion if generate_suggestions else None,
+            on_restart=restart_suggestions
+        )]
 
         # Step 2: Analyze coverage if topics provided
-        if expected_topics and existing_content:
-            coverage = await self.content_analyzer.analyze_coverage(
+        if run_coverage:
+            tasks.append(self.content_analyzer.analyze_coverage(
                 content_list=existing_content,
                 expected_topics=expected_topics
-            )
-            report.coverage_score = coverage.coverage_percentage
+            ))
 
         # Step 3: Generate FAQs from tickets
-        if generate_faqs and support_tickets:
-            faq_result = await self.faq_generator.generate(
+        if run_faqs:
+            tasks.append(self.faq_generator.generate(
                 tickets=support_tickets,
                 queries=search_queries,
                 documentation=existing_content
-            )
+            ))
+
+        try:
+            gap_result, *rest = await asyncio.gather(*tasks)
+        except BaseException:
+            for _, task in suggestion_tasks:
+                task.cancel()
+            raise
+
+        report.gaps = gap_result.gaps
+        report.gaps_found = len(gap_result.gaps)
+
+        if run_coverage:
+            coverage = rest.pop(0)
+            report.coverage_score = coverage.coverage_percentage
+
+        if run_faqs:
+            faq_result = rest.pop(0)
             report.faqs = faq_result.faqs
             report.faqs_generated = len(faq_result.faqs)
 
-        # Step 4: Generate content suggestions for gaps
+        # Step 4: Collect content suggestions for gaps
         if generate_suggestions:
-            for gap in gap_result.gaps[:5]:  # Top 5 gaps
-                suggestion = await self.content_analyzer.suggest_content(
-                    gap_title=gap.title,
-                    gap_description=gap.description,
-                    existing_content=content_titles[:10]
-                )
+            suggestions = await asyncio.gather(
+                *[task for _, task in suggestion_tasks], return_exceptions=True
+            )
+            for (gap, _), suggestion in zip(suggestion_tasks, suggestions):
+                if isinstance(suggestion, Exception):
+                    logger.warning("Content suggestion failed for gap %r: %s", gap.title, suggestion)
+                    continue
                 report.suggestions.append(suggestion)
             report.suggestions_created = len(report.suggestions)
 
         # Generate summary
         report.summary = self._generate_summary(report, gap_result)
-        report.duration_seconds = time.time() - start_time
+        report.duration_seconds = time.perf_counter() - start_time
 
         return report
 
@@ -126,10 +185,19 @@ class KnowledgeGapOrchestrator:
     ) -> ContentAnalysisResult:
         """Analyze content quality."""
         result = ContentAnalysisResult()
-        
-        for content in content_list[:20]:
-            quality = await self.content_analyzer.analyze_quality(content)
-            result.quality_assessments.append(quality)
+        contents = content_list[:20]
+
+        try:
+            result.quality_assessments = await self.content_analyzer.analyze_quality_batch(contents)
+        except ValueError as e:
+            logger.warning("Batched quality analysis failed, analyzing items individually: %s", e)
+            semaphore = asyncio.Semaphore(settings.quality_analysis_concurrency)
+
+            async def analyze(content: Dict[str, Any]):
+                async with semaphore:
+                    return await self.content_analyzer.analyze_quality(content)
+
+            result.quality_assessments = list(await asyncio.gather(*[analyze(c) for c in contents]))
 
         # Calculate summary
         if result.quality_assessments:
@@ -160,3 +228,9 @@ class KnowledgeGapOrchestrator:
             parts.append(f"ATTENTION: {len(critical_gaps)} critical gaps require immediate attention.")
 
         return " ".join(parts)
+
+
+@lru_cache(maxsize=1)
+def get_orchestrator() -> KnowledgeGapOrchestrator:
+    """Get the shared orchestrator; it holds no per-request state."""
+    return KnowledgeGapOrchestrator()
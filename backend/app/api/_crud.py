@@ -0,0 +1,102 @@
+"""Shared CRUD routes and helpers for the resource routers."""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence, Type
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Path
+from pydantic import BaseModel
+from sqlalchemy import delete, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable, Select
+
+from app.api._routing import ORJSONRoute
+from app.core.cache import invalidate
+from app.core.database import get_db
+
+
+def keyset_page(
+    query: Select,
+    sort_column: Any,
+    id_column: Any,
+    before: Optional[datetime],
+    before_id: Optional[uuid.UUID]
+) -> Select:
+    """Order a list query newest first and apply its (timestamp, id) cursor.
+
+    Clients pass the last row's timestamp and id as before/before_id. The id
+    breaks ties between rows sharing a timestamp, e.g. from one bulk insert.
+    Aware timestamps are converted to naive UTC to match the columns.
+    """
+    if before is not None:
+        if before.tzinfo is not None:
+            before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        if before_id is not None:
+            query = query.where(tuple_(sort_column, id_column) < (before, before_id))
+        else:
+            query = query.where(sort_column < before)
+    return query.order_by(sort_column.desc(), id_column.desc())
+
+
+async def execute_or_404(
+    db: AsyncSession,
+    statement: Executable,
+    namespace: str,
+    detail: str
+) -> None:
+    """Run an UPDATE/DELETE ... RETURNING id, commit and invalidate its cache.
+
+    Raises a 404 when the statement matched no row.
+    """
+    result = await db.execute(statement)
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail=detail)
+
+    await db.commit()
+    await invalidate(namespace)
+
+
+def make_crud_router(
+    model: Type[Any],
+    response_cls: Type[BaseModel],
+    prefix: str,
+    tag: str,
+    label: str,
+    id_key: str,
+    load_options: Sequence[Any] = ()
+) -> APIRouter:
+    """Build a router with GET and DELETE by id for a model.
+
+    The id path parameter is named id_key (e.g. faq_id), as are the route
+    names after the label, so OpenAPI names and 422 error locations match
+    the resource. GET loads the row with load_options, e.g. selectinload()
+    for the relationships its response needs. The resource's cache
+    namespace is its tag. Listing, creation and updates differ per
+    resource, so modules add those routes to the returned router.
+    """
+    router = APIRouter(prefix=prefix, tags=[tag], route_class=ORJSONRoute)
+    not_found = f"{label} not found"
+    path = f"/{{{id_key}}}"
+    name = label.lower()
+
+    @router.get(path, response_model=response_cls, summary=f"Get {label}", name=f"get_{name}")
+    async def get_item(item_id: uuid.UUID = Path(alias=id_key), db: AsyncSession = Depends(get_db)):
+        item = await db.get(model, item_id, options=load_options)
+        if not item:
+            raise HTTPException(status_code=404, detail=not_found)
+        return response_cls.from_db(item)
+
+    @router.delete(path, summary=f"Delete {label}", name=f"delete_{name}")
+    async def delete_item(
+        item_id: uuid.UUID = Path(alias=id_key),
+        db: AsyncSession = Depends(get_db)
+    ) -> Dict[str, Any]:
+        await execute_or_404(
+            db,
+            delete(model).where(model.id == item_id).returning(model.id),
+            tag,
+            not_found
+        )
+        return {"deleted": True, id_key: item_id}
+
+    return router
@@ -1,21 +1,27 @@
 """Analysis API routes."""
 
+import logging
 from datetime import datetime
 from typing import List, Optional
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from app.core.database import get_db
+from app.api._crud import keyset_page
+from app.api._routing import ORJSONRoute
+from app.core.cache import cached_response, invalidate
+from app.core.database import AsyncSessionLocal, bulk_insert, get_db, utcnow
 from app.models.db_models import AnalysisReportDB, GapDB, FAQDB
-from app.agents.orchestrator import KnowledgeGapOrchestrator
+from app.agents.orchestrator import get_orchestrator
 
-router = APIRouter(prefix="/analysis", tags=["analysis"])
+logger = logging.getLogger(__name__)
 
+router = APIRouter(prefix="/analysis", tags=["analysis"], route_class=ORJSONRoute)
 
-@router.post("/run")
+
+@router.post("/run", status_code=202)
 async def run_analysis(
     search_queries: List[dict] = None,
     support_tickets: List[dict] = None,
@@ -24,109 +30,136 @@ async def run_analysis(
     background_tasks: BackgroundTasks = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Run full knowledge gap analysis."""
+    """Start a full knowledge gap analysis.
+
+    The analysis runs in the background; poll the returned report for its
+    status and results.
+    """
     # Create report record
-    report_id = str(uuid.uuid4())
     db_report = AnalysisReportDB(
-        id=report_id,
         report_type="full_analysis",
         status="running"
     )
     db.add(db_report)
     await db.commit()
-
-    # Run analysis
-    orchestrator = KnowledgeGapOrchestrator()
-    result = await orchestrator.run_full_analysis(
-        search_queries=search_queries or [],
-        support_tickets=support_tickets or [],
-        expected_topics=expected_topics or [],
-        generate_faqs=generate_faqs
+    report_id = db_report.id
+    await invalidate("reports")
+
+    background_tasks.add_task(
+        _run_analysis_bg,
+        report_id,
+        search_queries or [],
+        support_tickets or [],
+        expected_topics or [],
+        generate_faqs
     )
 
-    # Save gaps
-    for gap in result.gaps:
-        db_gap = GapDB(
-            id=str(uuid.uuid4()),
-            title=gap.title,
-            description=gap.description,
-            topic=gap.topic,
-            priority=gap.priority,
-            source="content_analysis",
-            impact_score=gap.impact_score,
-            suggested_content=gap.suggested_content
-        )
-        db.add(db_gap)
-
-    # Save FAQs
-    for faq in result.faqs:
-        db_faq = FAQDB(
-            id=str(uuid.uuid4()),
-            question=faq.question,
-            answer=faq.answer,
-            category=faq.category,
-            confidence_score=faq.confidence_score,
-            status="pending_review"
-        )
-        db.add(db_faq)
-
-    # Update report
-    db_report.status = "completed"
-    db_report.gaps_found = result.gaps_found
-    db_report.faqs_generated = result.faqs_generated
-    db_report.suggestions_created = result.suggestions_created
-    db_report.coverage_after = result.coverage_score
-    db_report.summary = result.summary
-    db_report.completed_at = datetime.utcnow()
-
-    await db.commit()
-
-    return {
-        "report_id": report_id,
-        "status": "completed",
-        "gaps_found": result.gaps_found,
-        "faqs_generated": result.faqs_generated,
-        "suggestions_created": result.suggestions_created,
-        "summary": result.summary,
-        "duration_seconds": result.duration_seconds
-    }
+    return {"report_id": report_id, "status": "running"}
+
+
+async def _run_analysis_bg(
+    report_id: uuid.UUID,
+    search_queries: List[dict],
+    support_tickets: List[dict],
+    expected_topics: List[str],
+    generate_faqs: bool
+) -> None:
+    """Run the analysis and store its results, outside the request."""
+    async with AsyncSessionLocal() as db:
+        try:
+            orchestrator = get_orchestrator()
+            result = await orchestrator.run_full_analysis(
+                search_queries=search_queries,
+                support_tickets=support_tickets,
+                expected_topics=expected_topics,
+                generate_faqs=generate_faqs
+            )
+
+            # Save gaps and FAQs, one bulk insert per table
+            gap_rows = [{
+                "title": gap.title,
+                "description": gap.description,
+                "topic": gap.topic,
+                "priority": gap.priority,
+                "source": "content_analysis",
+                "impact_score": gap.impact_score,
+                "suggested_content": gap.suggested_content
+            } for gap in result.gaps]
+            await bulk_insert(db, GapDB, gap_rows)
+
+            faq_rows = [{
+                "question": faq.question,
+                "answer": faq.answer,
+                "category": faq.category,
+                "confidence_score": faq.confidence_score,
+                "status": "pending_review"
+            } for faq in result.faqs]
+            await bulk_insert(db, FAQDB, faq_rows)
+
+            # Update report
+            await db.execute(
+                update(AnalysisReportDB)
+                .where(AnalysisReportDB.id == report_id)
+                .values(
+                    status="completed",
+                    gaps_found=result.gaps_found,
+                    faqs_generated=result.faqs_generated,
+                    suggestions_created=result.suggestions_created,
+                    coverage_after=result.coverage_score,
+                    summary=result.summary,
+                    details={"duration_seconds": result.duration_seconds},
+                    completed_at=utcnow()
+                )
+            )
+            await db.commit()
+        except Exception as e:
+            logger.exception("Analysis %s failed", report_id)
+            await db.rollback()
+            await db.execute(
+                update(AnalysisReportDB)
+                .where(AnalysisReportDB.id == report_id)
+                .values(status="failed", summary=f"Analysis failed: {e}", completed_at=utcnow())
+            )
+            await db.commit()
+        finally:
+            await invalidate("reports", "gaps", "faqs")
 
 
 @router.get("/reports")
+@cached_response("reports")
 async def list_reports(
+    before: Optional[datetime] = Query(None, description="Keyset cursor: created_at of the last report seen"),
+    before_id: Optional[uuid.UUID] = Query(None, description="Keyset cursor: id of the last report seen"),
     limit: int = 20,
     db: AsyncSession = Depends(get_db)
 ):
     """List analysis reports."""
-    result = await db.execute(
-        select(AnalysisReportDB)
-        .order_by(AnalysisReportDB.created_at.desc())
-        .limit(limit)
+    # Select only the listed columns; details are served by get_report
+    query = select(
+        AnalysisReportDB.id,
+        AnalysisReportDB.report_type,
+        AnalysisReportDB.status,
+        AnalysisReportDB.gaps_found,
+        AnalysisReportDB.faqs_generated,
+        AnalysisReportDB.summary,
+        AnalysisReportDB.created_at,
+        AnalysisReportDB.completed_at
     )
-    reports = result.scalars().all()
+    query = keyset_page(
+        query, AnalysisReportDB.created_at, AnalysisReportDB.id, before, before_id
+    ).limit(limit)
+    result = await db.execute(query)
 
-    return [{
-        "id": r.id,
-        "report_type": r.report_type,
-        "status": r.status,
-        "gaps_found": r.gaps_found,
-        "faqs_generated": r.faqs_generated,
-        "summary": r.summary,
-        "created_at": r.created_at.isoformat(),
-        "completed_at": r.completed_at.isoformat() if r.completed_at else None
-    } for r in reports]
+    return [row._asdict() for row in result.all()]
 
 
 @router.get("/reports/{report_id}")
 async def get_report(
-    report_id: str,
+    report_id: uuid.UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """Get analysis report details."""
-    result = await db.execute(
-        select(AnalysisReportDB).where(AnalysisReportDB.id == report_id)
-    )
-    report = result.scalar_one_or_none()
+    report = await db.get(AnalysisReportDB, report_id)
 
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
@@ -142,6 +175,6 @@ async def get_report(
         "coverage_after": report.coverage_after,
         "summary": report.summary,
         "details": report.details,
-        "created_at": report.created_at.isoformat(),
-        "completed_at": report.completed_at.isoformat() if report.completed_at else None
+        "created_at": report.created_at,
+        "completed_at": report.completed_at
     }
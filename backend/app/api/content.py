@@ -1,49 +1,58 @@
 """Content API routes."""
 
+import hashlib
+from datetime import datetime
 from typing import List, Optional
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 
+from app.api._crud import keyset_page
+from app.api._routing import ORJSONRoute
+from app.core.cache import cached_response, get_cached, set_cached
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.content import Content, ContentType
 from app.models.db_models import ContentDB
-from app.agents.orchestrator import KnowledgeGapOrchestrator
+from app.agents.orchestrator import get_orchestrator
 
-router = APIRouter(prefix="/content", tags=["content"])
+router = APIRouter(prefix="/content", tags=["content"], route_class=ORJSONRoute)
 
 
 @router.get("")
+@cached_response("content")
 async def list_content(
     content_type: Optional[ContentType] = Query(None),
     category: Optional[str] = Query(None),
+    before: Optional[datetime] = Query(None, description="Keyset cursor: last_updated of the last item seen"),
+    before_id: Optional[uuid.UUID] = Query(None, description="Keyset cursor: id of the last item seen"),
     limit: int = Query(50, le=100),
     db: AsyncSession = Depends(get_db)
 ):
     """List knowledge base content."""
-    query = select(ContentDB)
+    # Select only the listed columns, skipping the content body
+    query = select(
+        ContentDB.id,
+        ContentDB.title,
+        ContentDB.content_type,
+        ContentDB.category,
+        ContentDB.view_count,
+        ContentDB.freshness_score,
+        ContentDB.completeness_score,
+        ContentDB.last_updated
+    )
 
     if content_type:
         query = query.where(ContentDB.content_type == content_type.value)
     if category:
         query = query.where(ContentDB.category == category)
 
-    query = query.order_by(ContentDB.last_updated.desc()).limit(limit)
+    query = keyset_page(query, ContentDB.last_updated, ContentDB.id, before, before_id).limit(limit)
     result = await db.execute(query)
-    content = result.scalars().all()
 
-    return [{
-        "id": c.id,
-        "title": c.title,
-        "content_type": c.content_type,
-        "category": c.category,
-        "view_count": c.view_count,
-        "freshness_score": c.freshness_score,
-        "completeness_score": c.completeness_score,
-        "last_updated": c.last_updated.isoformat()
-    } for c in content]
+    return [row._asdict() for row in result.all()]
 
 
 @router.get("/coverage")
@@ -51,28 +60,42 @@ async def get_coverage_report(
     expected_topics: List[str] = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get content coverage report."""
-    result = await db.execute(select(ContentDB))
-    content_list = result.scalars().all()
+    """Get content coverage report.
+
+    Reports are cached per content version (latest update time and row
+    count) and requested topics, so the content scan and LLM call only
+    rerun after content changes.
+    """
+    version = (await db.execute(
+        select(func.max(ContentDB.last_updated), func.count(ContentDB.id))
+    )).one()
+    topics = ",".join(sorted(expected_topics)) if expected_topics else ""
+    cache_key = hashlib.sha1(f"{version[0]}|{version[1]}|{topics}".encode()).hexdigest()
+    cached = await get_cached("coverage", cache_key)
+    if cached is not None:
+        return cached
 
     if not expected_topics:
         # Use unique categories as topics
-        expected_topics = list(set(c.category for c in content_list))
-
-    content_data = [{
-        "id": c.id,
-        "title": c.title,
-        "content": c.content[:500],
-        "category": c.category
-    } for c in content_list]
-
-    orchestrator = KnowledgeGapOrchestrator()
+        result = await db.execute(select(ContentDB.category).distinct())
+        expected_topics = result.scalars().all()
+
+    # Truncate the content body in SQL rather than fetching it in full
+    result = await db.execute(select(
+        ContentDB.id,
+        ContentDB.title,
+        func.substr(ContentDB.content, 1, 500).label("content"),
+        ContentDB.category
+    ))
+    content_data = [row._asdict() for row in result.all()]
+
+    orchestrator = get_orchestrator()
     coverage = await orchestrator.content_analyzer.analyze_coverage(
         content_list=content_data,
         expected_topics=expected_topics
     )
 
-    return {
+    report = {
         "total_topics": coverage.total_topics,
         "covered_topics": coverage.covered_topics,
         "coverage_percentage": coverage.coverage_percentage,
@@ -81,6 +104,8 @@ async def get_coverage_report(
         "not_covered": coverage.not_covered,
         "recommendations": coverage.recommendations
     }
+    await set_cached("coverage", cache_key, report, settings.coverage_cache_ttl_seconds)
+    return report
 
 
 @router.post("/suggestions")
@@ -91,9 +116,9 @@ async def get_content_suggestions(
 ):
     """Get content suggestions for a gap."""
     result = await db.execute(select(ContentDB.title).limit(20))
-    existing = [r[0] for r in result.fetchall()]
+    existing = tuple(result.scalars())
 
-    orchestrator = KnowledgeGapOrchestrator()
+    orchestrator = get_orchestrator()
     suggestion = await orchestrator.content_analyzer.suggest_content(
         gap_title=gap_title,
         gap_description=gap_description,
@@ -113,24 +138,23 @@ async def get_content_suggestions(
 
 @router.post("/quality")
 async def analyze_content_quality(
-    content_ids: List[str],
+    content_ids: List[uuid.UUID],
     db: AsyncSession = Depends(get_db)
 ):
     """Analyze quality of specified content."""
-    result = await db.execute(
+    content_list = await db.scalars(
         select(ContentDB).where(ContentDB.id.in_(content_ids))
     )
-    content_list = result.scalars().all()
 
     content_data = [{
-        "id": c.id,
+        "id": str(c.id),
         "title": c.title,
         "content": c.content,
         "category": c.category,
         "last_updated": c.last_updated.isoformat()
     } for c in content_list]
 
-    orchestrator = KnowledgeGapOrchestrator()
+    orchestrator = get_orchestrator()
     analysis = await orchestrator.analyze_content_quality(content_data)
 
     return {
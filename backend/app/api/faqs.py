@@ -4,55 +4,50 @@ from datetime import datetime
 from typing import List, Optional
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from app.core.database import get_db
+from app.api._crud import execute_or_404, keyset_page, make_crud_router
+from app.core.cache import cached_response, invalidate
+from app.core.database import bulk_insert, get_db, utcnow
 from app.models.faq import FAQ, FAQCreate, FAQResponse, FAQStatus
 from app.models.db_models import FAQDB
-from app.agents.orchestrator import KnowledgeGapOrchestrator
+from app.agents.orchestrator import get_orchestrator
 
-router = APIRouter(prefix="/faqs", tags=["faqs"])
+# GET and DELETE /faqs/{id} come from the shared CRUD router
+router = make_crud_router(FAQDB, FAQResponse, prefix="/faqs", tag="faqs", label="FAQ", id_key="faq_id")
 
 
-@router.get("", response_model=List[FAQResponse])
+@router.get("", responses={200: {"model": List[FAQResponse]}})
+@cached_response("faqs")
 async def list_faqs(
     status: Optional[FAQStatus] = Query(None),
     category: Optional[str] = Query(None),
+    before: Optional[datetime] = Query(None, description="Keyset cursor: created_at of the last FAQ seen"),
+    before_id: Optional[uuid.UUID] = Query(None, description="Keyset cursor: id of the last FAQ seen"),
     limit: int = Query(50, le=100),
     db: AsyncSession = Depends(get_db)
 ):
     """List FAQs."""
-    query = select(FAQDB)
+    # Core select: rows go straight to JSON without ORM or model objects
+    query = select(FAQDB.__table__)
 
     if status:
         query = query.where(FAQDB.status == status.value)
     if category:
         query = query.where(FAQDB.category == category)
 
-    query = query.order_by(FAQDB.created_at.desc()).limit(limit)
+    query = keyset_page(query, FAQDB.created_at, FAQDB.id, before, before_id).limit(limit)
     result = await db.execute(query)
-    faqs = result.scalars().all()
 
-    return [_faq_to_response(f) for f in faqs]
-
-
-@router.get("/{faq_id}", response_model=FAQResponse)
-async def get_faq(faq_id: str, db: AsyncSession = Depends(get_db)):
-    """Get FAQ details."""
-    result = await db.execute(select(FAQDB).where(FAQDB.id == faq_id))
-    faq = result.scalar_one_or_none()
-    if not faq:
-        raise HTTPException(status_code=404, detail="FAQ not found")
-    return _faq_to_response(faq)
+    return [row._asdict() for row in result]
 
 
 @router.post("", response_model=FAQResponse)
 async def create_faq(faq: FAQCreate, db: AsyncSession = Depends(get_db)):
     """Create a FAQ manually."""
     db_faq = FAQDB(
-        id=str(uuid.uuid4()),
         question=faq.question,
         answer=faq.answer,
         category=faq.category,
@@ -60,8 +55,8 @@ async def create_faq(faq: FAQCreate, db: AsyncSession = Depends(get_db)):
     )
     db.add(db_faq)
     await db.commit()
-    await db.refresh(db_faq)
-    return _faq_to_response(db_faq)
+    await invalidate("faqs")
+    return FAQResponse.from_db(db_faq)
 
 
 @router.post("/generate")
@@ -71,32 +66,29 @@ async def generate_faqs(
     db: AsyncSession = Depends(get_db)
 ):
     """Generate FAQs from data."""
-    orchestrator = KnowledgeGapOrchestrator()
+    orchestrator = get_orchestrator()
     result = await orchestrator.generate_faqs_only(
         support_tickets=support_tickets or [],
         search_queries=search_queries or []
     )
 
-    # Save generated FAQs
-    saved_faqs = []
-    for faq in result.faqs:
-        db_faq = FAQDB(
-            id=str(uuid.uuid4()),
-            question=faq.question,
-            answer=faq.answer,
-            category=faq.category,
-            confidence_score=faq.confidence_score,
-            source_queries=faq.related_questions,
-            tags=faq.tags,
-            status="pending_review"
-        )
-        db.add(db_faq)
-        saved_faqs.append(db_faq)
+    # Save generated FAQs in one bulk insert
+    faq_rows = [{
+        "question": faq.question,
+        "answer": faq.answer,
+        "category": faq.category,
+        "confidence_score": faq.confidence_score,
+        "source_queries": faq.related_questions,
+        "tags": faq.tags,
+        "status": "pending_review"
+    } for faq in result.faqs]
+    ids = await bulk_insert(db, FAQDB, faq_rows)
 
     await db.commit()
+    await invalidate("faqs")
 
     return {
-        "faqs_generated": len(result.faqs),
+        "faqs_generated": len(ids),
         "categories": result.categories_covered,
         "summary": result.generation_summary
     }
@@ -104,97 +96,66 @@ async def generate_faqs(
 
 @router.put("/{faq_id}")
 async def update_faq(
-    faq_id: str,
+    faq_id: uuid.UUID,
     updates: dict,
     db: AsyncSession = Depends(get_db)
 ):
     """Update a FAQ."""
-    result = await db.execute(select(FAQDB).where(FAQDB.id == faq_id))
-    faq = result.scalar_one_or_none()
-    if not faq:
-        raise HTTPException(status_code=404, detail="FAQ not found")
-
     allowed = ["question", "answer", "category", "tags", "status"]
-    for field in allowed:
-        if field in updates:
-            setattr(faq, field, updates[field])
-
-    faq.updated_at = datetime.utcnow()
-    await db.commit()
+    values = {field: updates[field] for field in allowed if field in updates}
+    if "status" in values:
+        try:
+            values["status"] = FAQStatus(values["status"])
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"Invalid FAQ status: {values['status']!r}")
+
+    await execute_or_404(
+        db,
+        update(FAQDB)
+        .where(FAQDB.id == faq_id)
+        .values(**values, updated_at=utcnow())
+        .returning(FAQDB.id),
+        "faqs",
+        "FAQ not found"
+    )
 
     return {"updated": True, "faq_id": faq_id}
 
 
 @router.post("/{faq_id}/publish")
-async def publish_faq(faq_id: str, db: AsyncSession = Depends(get_db)):
+async def publish_faq(faq_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
     """Publish a FAQ."""
-    result = await db.execute(select(FAQDB).where(FAQDB.id == faq_id))
-    faq = result.scalar_one_or_none()
-    if not faq:
-        raise HTTPException(status_code=404, detail="FAQ not found")
-
-    faq.status = "published"
-    faq.published_at = datetime.utcnow()
-    faq.updated_at = datetime.utcnow()
-    await db.commit()
+    now = utcnow()
+    await execute_or_404(
+        db,
+        update(FAQDB)
+        .where(FAQDB.id == faq_id)
+        .values(status="published", published_at=now, updated_at=now)
+        .returning(FAQDB.id),
+        "faqs",
+        "FAQ not found"
+    )
 
     return {"published": True, "faq_id": faq_id}
 
 
 @router.post("/{faq_id}/feedback")
 async def faq_feedback(
-    faq_id: str,
+    faq_id: uuid.UUID,
     helpful: bool,
     db: AsyncSession = Depends(get_db)
 ):
     """Record FAQ helpfulness feedback."""
-    result = await db.execute(select(FAQDB).where(FAQDB.id == faq_id))
-    faq = result.scalar_one_or_none()
-    if not faq:
-        raise HTTPException(status_code=404, detail="FAQ not found")
-
-    if helpful:
-        faq.helpful_count += 1
-    else:
-        faq.not_helpful_count += 1
-
-    await db.commit()
+    # Increment in SQL so concurrent votes aren't lost
+    counter = FAQDB.helpful_count if helpful else FAQDB.not_helpful_count
+    await execute_or_404(
+        db,
+        update(FAQDB)
+        .where(FAQDB.id == faq_id)
+        .values({counter: counter + 1})
+        .returning(FAQDB.id),
+        "faqs",
+        "FAQ not found"
+    )
     return {"recorded": True}
 
-
-@router.delete("/{faq_id}")
-async def delete_faq(faq_id: str, db: AsyncSession = Depends(get_db)):
-    """Delete a FAQ."""
-    result = await db.execute(select(FAQDB).where(FAQDB.id == faq_id))
-    faq = result.scalar_one_or_none()
-    if not faq:
-        raise HTTPException(status_code=404, detail="FAQ not found")
-
-    await db.delete(faq)
-    await db.commit()
-    return {"deleted": True}
-
-
-def _faq_to_response(faq: FAQDB) -> FAQResponse:
-    total_votes = faq.helpful_count + faq.not_helpful_count
-    helpfulness = faq.helpful_count / total_votes if total_votes > 0 else None
-
-    return FAQResponse(
-        id=faq.id,
-        question=faq.question,
-        answer=faq.answer,
-        category=faq.category,
-        status=FAQStatus(faq.status),
-        source_tickets=faq.source_tickets or [],
-        source_queries=faq.source_queries or [],
-        confidence_score=faq.confidence_score,
-        view_count=faq.view_count,
-        helpful_count=faq.helpful_count,
-        not_helpful_count=faq.not_helpful_count,
-        related_faqs=faq.related_faqs or [],
-        tags=faq.tags or [],
-        created_at=faq.created_at,
-        updated_at=faq.updated_at,
-        published_at=faq.published_at,
-        helpfulness_ratio=helpfulness
-    )
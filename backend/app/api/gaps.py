@@ -1,22 +1,30 @@
 """Gaps API routes."""
 
-from datetime import datetime
+from collections import defaultdict
 from typing import List, Optional
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
-from app.models.gap import Gap, GapCreate, GapResponse, GapStatus, GapPriority
-from app.models.db_models import GapDB
-from app.agents.orchestrator import KnowledgeGapOrchestrator
+from app.api._crud import execute_or_404, make_crud_router
+from app.core.cache import cached_response, invalidate
+from app.core.database import bulk_insert, get_db, utcnow
+from app.models.gap import Gap, GapCreate, GapResponse, GapStatus, GapPriority, text_evidence
+from app.models.db_models import ContentDB, GapDB, gap_content
+from app.agents.orchestrator import get_orchestrator
 
-router = APIRouter(prefix="/gaps", tags=["gaps"])
+# GET and DELETE /gaps/{id} come from the shared CRUD router
+router = make_crud_router(
+    GapDB, GapResponse, prefix="/gaps", tag="gaps", label="Gap", id_key="gap_id",
+    load_options=[selectinload(GapDB.related_content)]
+)
 
 
-@router.get("", response_model=List[GapResponse])
+@router.get("", responses={200: {"model": List[GapResponse]}})
+@cached_response("gaps")
 async def list_gaps(
     status: Optional[GapStatus] = Query(None),
     priority: Optional[GapPriority] = Query(None),
@@ -25,7 +33,8 @@ async def list_gaps(
     db: AsyncSession = Depends(get_db)
 ):
     """List identified knowledge gaps."""
-    query = select(GapDB)
+    # Core select: rows go straight to JSON without ORM or model objects
+    query = select(GapDB.__table__)
 
     if status:
         query = query.where(GapDB.status == status.value)
@@ -36,37 +45,50 @@ async def list_gaps(
 
     query = query.order_by(GapDB.impact_score.desc()).limit(limit)
     result = await db.execute(query)
-    gaps = result.scalars().all()
-
-    return [_gap_to_response(g) for g in gaps]
+    gaps = [row._asdict() for row in result]
 
+    # Related content ids for the whole page in one IN query, as selectinload does
+    related = defaultdict(list)
+    if gaps:
+        links = await db.execute(
+            select(gap_content).where(gap_content.c.gap_id.in_([gap["id"] for gap in gaps]))
+        )
+        for gap_id, content_id in links:
+            related[gap_id].append(content_id)
+    for gap in gaps:
+        gap["related_content_ids"] = related[gap["id"]]
 
-@router.get("/{gap_id}", response_model=GapResponse)
-async def get_gap(gap_id: str, db: AsyncSession = Depends(get_db)):
-    """Get gap details."""
-    result = await db.execute(select(GapDB).where(GapDB.id == gap_id))
-    gap = result.scalar_one_or_none()
-    if not gap:
-        raise HTTPException(status_code=404, detail="Gap not found")
-    return _gap_to_response(gap)
+    return gaps
 
 
 @router.post("", response_model=GapResponse)
 async def create_gap(gap: GapCreate, db: AsyncSession = Depends(get_db)):
     """Create a gap manually."""
+    related_content = []
+    if gap.related_content_ids:
+        related_content = list(await db.scalars(
+            select(ContentDB).where(ContentDB.id.in_(gap.related_content_ids))
+        ))
+        missing = set(gap.related_content_ids) - {content.id for content in related_content}
+        if missing:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown content ids: {', '.join(sorted(str(i) for i in missing))}"
+            )
+
     db_gap = GapDB(
-        id=str(uuid.uuid4()),
         title=gap.title,
         description=gap.description,
         topic=gap.topic,
-        priority=gap.priority.value,
-        source=gap.source.value,
-        tags=gap.tags
+        priority=gap.priority,
+        source=gap.source,
+        tags=gap.tags,
+        related_content=related_content
     )
     db.add(db_gap)
     await db.commit()
-    await db.refresh(db_gap)
-    return _gap_to_response(db_gap)
+    await invalidate("gaps")
+    return GapResponse.from_db(db_gap)
 
 
 @router.post("/analyze")
@@ -76,34 +98,31 @@ async def analyze_gaps(
     db: AsyncSession = Depends(get_db)
 ):
     """Run gap analysis on provided data."""
-    orchestrator = KnowledgeGapOrchestrator()
+    orchestrator = get_orchestrator()
     result = await orchestrator.detect_gaps_only(
         search_queries=search_queries or [],
         support_tickets=support_tickets or []
     )
 
-    # Save detected gaps
-    saved_gaps = []
-    for gap in result.gaps:
-        db_gap = GapDB(
-            id=str(uuid.uuid4()),
-            title=gap.title,
-            description=gap.description,
-            topic=gap.topic,
-            priority=gap.priority,
-            source="content_analysis",
-            evidence=gap.evidence,
-            search_queries=gap.search_queries,
-            impact_score=gap.impact_score,
-            suggested_content=gap.suggested_content
-        )
-        db.add(db_gap)
-        saved_gaps.append(db_gap)
+    # Save detected gaps in one bulk insert
+    gap_rows = [{
+        "title": gap.title,
+        "description": gap.description,
+        "topic": gap.topic,
+        "priority": gap.priority,
+        "source": "content_analysis",
+        "evidence": text_evidence(gap.evidence),
+        "search_queries": gap.search_queries,
+        "impact_score": gap.impact_score,
+        "suggested_content": gap.suggested_content
+    } for gap in result.gaps]
+    ids = await bulk_insert(db, GapDB, gap_rows)
 
     await db.commit()
+    await invalidate("gaps")
 
     return {
-        "gaps_found": len(result.gaps),
+        "gaps_found": len(ids),
         "summary": result.analysis_summary,
         "coverage_score": result.coverage_score
     }
@@ -111,52 +130,20 @@ async def analyze_gaps(
 
 @router.put("/{gap_id}/status")
 async def update_gap_status(
-    gap_id: str,
+    gap_id: uuid.UUID,
     status: GapStatus,
     db: AsyncSession = Depends(get_db)
 ):
     """Update gap status."""
-    result = await db.execute(select(GapDB).where(GapDB.id == gap_id))
-    gap = result.scalar_one_or_none()
-    if not gap:
-        raise HTTPException(status_code=404, detail="Gap not found")
-
-    gap.status = status.value
-    gap.updated_at = datetime.utcnow()
-    await db.commit()
+    await execute_or_404(
+        db,
+        update(GapDB)
+        .where(GapDB.id == gap_id)
+        .values(status=status.value, updated_at=utcnow())
+        .returning(GapDB.id),
+        "gaps",
+        "Gap not found"
+    )
 
     return {"updated": True, "gap_id": gap_id, "status": status.value}
 
-
-@router.delete("/{gap_id}")
-async def delete_gap(gap_id: str, db: AsyncSession = Depends(get_db)):
-    """Delete a gap."""
-    result = await db.execute(select(GapDB).where(GapDB.id == gap_id))
-    gap = result.scalar_one_or_none()
-    if not gap:
-        raise HTTPException(status_code=404, detail="Gap not found")
-
-    await db.delete(gap)
-    await db.commit()
-    return {"deleted": True, "gap_id": gap_id}
-
-
-def _gap_to_response(gap: GapDB) -> GapResponse:
-    return GapResponse(
-        id=gap.id,
-        title=gap.title,
-        description=gap.description,
-        topic=gap.topic,
-        priority=GapPriority(gap.priority),
-        status=GapStatus(gap.status),
-        source=gap.source,
-        evidence=gap.evidence or [],
-        search_queries=gap.search_queries or [],
-        ticket_count=gap.ticket_count,
-        impact_score=gap.impact_score,
-        suggested_content=gap.suggested_content,
-        related_content_ids=gap.related_content_ids or [],
-        tags=gap.tags or [],
-        created_at=gap.created_at,
-        updated_at=gap.updated_at
-    )
@@ -2,5 +2,6 @@
 
 from app.core.config import settings
 from app.core.llm import get_llm
+from app.core.llm_cache import get_cached_llm
 
-__all__ = ["settings", "get_llm"]
+__all__ = ["settings", "get_llm", "get_cached_llm"]
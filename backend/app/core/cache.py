@@ -0,0 +1,191 @@
+"""Response cache for read-heavy API endpoints.
+
+Cached responses are stored as serialized JSON under a namespace (one per
+resource, e.g. "gaps"), keyed by the endpoint's query parameters. Writes to a
+resource invalidate its whole namespace. Redis is used when REDIS_URL is
+set, so the cache is shared across workers; otherwise each process keeps an
+in-memory cache.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import Response
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend:
+    """Per-process cache backend with per-entry expiry and LRU eviction.
+
+    Keys come from arbitrary query parameters, so the number of entries is
+    capped; the least recently used entry is evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+
+    async def get(self, namespace: str, key: str) -> Optional[bytes]:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[(namespace, key)]
+            return None
+        self._entries.move_to_end((namespace, key))
+        return value
+
+    async def set(self, namespace: str, key: str, value: bytes, ttl: int) -> None:
+        self._entries[(namespace, key)] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, namespace: str) -> None:
+        for entry_key in [k for k in self._entries if k[0] == namespace]:
+            del self._entries[entry_key]
+
+
+# Deletes a namespace's tracked keys and the set itself in one atomic step,
+# so a key written meanwhile can't lose its set entry and outlive the
+# invalidation. DEL takes the keys in batches to stay within Lua's unpack limit.
+_INVALIDATE_SCRIPT = """
+local keys = redis.call('SMEMBERS', KEYS[1])
+for i = 1, #keys, 1000 do
+    redis.call('DEL', unpack(keys, i, math.min(i + 999, #keys)))
+end
+redis.call('DEL', KEYS[1])
+"""
+
+
+class RedisCacheBackend:
+    """Redis cache backend.
+
+    The keys cached for each namespace are tracked in a Redis set, so a
+    namespace is invalidated without scanning the keyspace. Writing a key
+    and tracking it happen in one transaction.
+    """
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+        self._invalidate = self._redis.register_script(_INVALIDATE_SCRIPT)
+
+    @staticmethod
+    def _keys(namespace: str) -> str:
+        return f"cache:{namespace}:keys"
+
+    async def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return await self._redis.get(f"cache:{namespace}:{key}")
+
+    async def set(self, namespace: str, key: str, value: bytes, ttl: int) -> None:
+        full_key = f"cache:{namespace}:{key}"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.setex(full_key, ttl, value)
+            pipe.sadd(self._keys(namespace), full_key)
+            pipe.expire(self._keys(namespace), ttl)
+            await pipe.execute()
+
+    async def invalidate(self, namespace: str) -> None:
+        await self._invalidate(keys=[self._keys(namespace)])
+
+
+@lru_cache()
+def get_cache_backend():
+    """Get the process-wide response cache backend."""
+    if settings.redis_url:
+        return RedisCacheBackend(settings.redis_url)
+    return MemoryCacheBackend(settings.response_cache_max_entries)
+
+
+def _cache_key(params: Dict[str, Any]) -> str:
+    """Hash endpoint parameters, ignoring injected database sessions."""
+    items = sorted(
+        (name, getattr(value, "value", value))
+        for name, value in params.items()
+        if not isinstance(value, AsyncSession)
+    )
+    return hashlib.sha1(repr(items).encode()).hexdigest()
+
+
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def cached_response(namespace: str) -> Callable:
+    """Cache a GET endpoint's JSON response under a namespace.
+
+    The endpoint must be called with keyword arguments only, as FastAPI does.
+    Its result is always returned as encoded JSON, so FastAPI's response_model
+    validation and jsonable_encoder are skipped. Cache errors are logged and
+    the endpoint is served uncached.
+    """
+    def decorator(endpoint: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @wraps(endpoint)
+        async def wrapper(**kwargs):
+            # pydantic-core serializes models, rows and datetimes in one pass
+            if not settings.response_cache_enabled:
+                return _json_response(to_json(await endpoint(**kwargs)))
+
+            backend = get_cache_backend()
+            key = _cache_key(kwargs)
+            try:
+                body = await backend.get(namespace, key)
+            except Exception as e:
+                logger.warning("Response cache read failed for %s: %s", namespace, e)
+                return _json_response(to_json(await endpoint(**kwargs)))
+
+            if body is None:
+                body = to_json(await endpoint(**kwargs))
+                try:
+                    await backend.set(namespace, key, body, settings.response_cache_ttl_seconds)
+                except Exception as e:
+                    logger.warning("Response cache write failed for %s: %s", namespace, e)
+            return _json_response(body)
+        return wrapper
+    return decorator
+
+
+async def get_cached(namespace: str, key: str) -> Optional[Any]:
+    """Get a cached JSON value, or None on a miss or cache error."""
+    if not settings.response_cache_enabled:
+        return None
+    try:
+        body = await get_cache_backend().get(namespace, key)
+    except Exception as e:
+        logger.warning("Cache read failed for %s: %s", namespace, e)
+        return None
+    return orjson.loads(body) if body is not None else None
+
+
+async def set_cached(namespace: str, key: str, value: Any, ttl: int) -> None:
+    """Cache a JSON-serializable value; cache errors are logged and ignored."""
+    if not settings.response_cache_enabled:
+        return
+    try:
+        await get_cache_backend().set(namespace, key, orjson.dumps(value), ttl)
+    except Exception as e:
+        logger.warning("Cache write failed for %s: %s", namespace, e)
+
+
+async def invalidate(*namespaces: str) -> None:
+    """Drop cached responses for the given namespaces after a write."""
+    if not settings.response_cache_enabled:
+        return
+    backend = get_cache_backend()
+    for namespace in namespaces:
+        try:
+            await backend.invalidate(namespace)
+        except Exception as e:
+            logger.warning("Response cache invalidation failed for %s: %s", namespace, e)
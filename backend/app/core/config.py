@@ -13,6 +13,18 @@ class Settings(BaseSettings):
     api_prefix: str = "/api"
 
     database_url: str = "sqlite+aiosqlite:///./knowledge_gap.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_recycle_seconds: int = 1800
+    db_pool_warmup: int = 5
+    db_copy_threshold: int = 100
+
+    # Response Cache (Redis when redis_url is set, otherwise in-process)
+    redis_url: Optional[str] = None
+    response_cache_enabled: bool = True
+    response_cache_ttl_seconds: int = 60
+    response_cache_max_entries: int = 1024
+    coverage_cache_ttl_seconds: int = 3600
 
     # LLM Provider
     llm_provider: str = "openai"
@@ -24,6 +36,24 @@ class Settings(BaseSettings):
     ollama_model: str = "llama3.2"
     llamacpp_model_path: Optional[str] = None
     llamacpp_n_ctx: int = 4096
+    embedding_dimensions: int = 1536
+
+    # LLM Throughput
+    llm_concurrency: int = 16
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 50
+
+    # LLM Response Cache
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 3600
+    llm_cache_max_entries: int = 1024
+    llm_cache_semantic: bool = False
+    llm_cache_similarity_threshold: float = 0.92
+
+    # Agents
+    quality_analysis_concurrency: int = 5
+    gap_dedupe_semantic: bool = False
+    gap_dedupe_similarity_threshold: float = 0.85
 
     # ChromaDB
     chroma_persist_directory: str = "./chroma_db"
@@ -1,12 +1,123 @@
 """Database configuration."""
 
+import asyncio
+from datetime import date, datetime, timezone
+import logging
+import os
+import time
+from typing import Any, Dict, List
+import uuid
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import JSON, DateTime, Table, event, insert, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import DeclarativeBase, Session, raiseload
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.expression import FunctionElement
 from app.core.config import settings
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
+logger = logging.getLogger(__name__)
+
+# Monthly partitions created ahead of time, counting the current month, and
+# how often the running app tops them up
+_PARTITION_MONTHS = 3
+_PARTITION_CHECK_SECONDS = 24 * 60 * 60
+
+
+def _engine_options() -> dict:
+    """Connection pool options; SQLite keeps the dialect's default pool."""
+    if settings.database_url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+
+
+def _json_serializer(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
+# orjson encodes and decodes the JSON/JSONB columns (evidence, details)
+engine = create_async_engine(
+    settings.database_url,
+    echo=settings.debug,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **_engine_options()
+)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed while an analysis is writing its results
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        # SQLite leaves foreign keys (and ON DELETE CASCADE) off by default
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-Base = declarative_base()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _raiseload_by_default(orm_execute_state):
+    # Relationships load only when a query asks for them, e.g. selectinload(),
+    # so a missing loader fails loudly instead of lazy-loading per row
+    if orm_execute_state.is_select and not (
+        orm_execute_state.is_column_load or orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+class Base(DeclarativeBase):
+    """Base class for database models."""
+
+
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, computed by the database.
+
+    PostgreSQL evaluates it per row, so rows inserted in one statement still
+    order by creation time. SQLite's 'now' is fixed for a whole statement,
+    so rows from one multi-row INSERT share a timestamp.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', clock_timestamp())"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # %f gives milliseconds; pad to the microseconds SQLAlchemy's SQLite
+    # DateTime writes, so stored values compare correctly with bound ones
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7) for primary keys.
+
+    The leading 48 bits are the Unix time in milliseconds, so new rows land
+    at the end of the primary-key index instead of at random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
 
 
 async def get_db() -> AsyncSession:
@@ -18,5 +129,139 @@ async def get_db() -> AsyncSession:
 
 
 async def init_db():
+    # Imported here because the models import this module
+    from app.models.migrations import migrate_db
+
     async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        await migrate_db(conn)
         await conn.run_sync(Base.metadata.create_all)
+    await create_partitions()
+
+
+async def create_partitions() -> None:
+    """Create upcoming monthly partitions of the partitioned tables.
+
+    PostgreSQL only. Runs from init_db and then daily via maintain_partitions,
+    so new months get their partition before rows arrive. A table created
+    before it was partitioned is skipped with a warning; init_db's migration
+    converts it.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not table.dialect_options["postgresql"]["partition_by"]:
+                continue
+            if await is_partitioned(conn, table):
+                await _create_month_partitions(conn, table)
+            else:
+                logger.warning("Table %s is not partitioned; not creating partitions", table.name)
+
+
+async def is_partitioned(conn, table: Table) -> bool:
+    """Whether a table exists as a partitioned table (PostgreSQL)."""
+    result = await conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"),
+        {"name": table.name},
+    )
+    return bool(result.scalar())
+
+
+async def maintain_partitions() -> None:
+    """Run create_partitions daily; started as a task for the app's lifetime."""
+    if engine.dialect.name != "postgresql":
+        return
+    while True:
+        await asyncio.sleep(_PARTITION_CHECK_SECONDS)
+        try:
+            await create_partitions()
+        except Exception as e:
+            logger.warning("Partition maintenance failed: %s", e)
+
+
+async def _create_month_partitions(conn, table: Table) -> None:
+    """Create a table's DEFAULT partition and its upcoming monthly partitions.
+
+    Partitioned tables are RANGE-partitioned by month. Rows outside the
+    created months land in the DEFAULT partition; a month whose rows are
+    already there can't get its own partition and is skipped with a warning.
+    """
+    await conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table.name}_default PARTITION OF {table.name} DEFAULT"))
+
+    today = datetime.now(timezone.utc).date()
+    year, month = today.year, today.month
+    for _ in range(_PARTITION_MONTHS):
+        start = date(year, month, 1)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        end = date(year, month, 1)
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {table.name}_{start:%Y_%m} PARTITION OF {table.name} "
+                    f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                ))
+        except DBAPIError as e:
+            logger.warning("Could not create partition %s_%s: %s", table.name, f"{start:%Y_%m}", e)
+
+
+async def warmup_db():
+    """Open pooled connections up front so first requests don't pay for them."""
+    if settings.database_url.startswith("sqlite") or settings.db_pool_warmup <= 0:
+        return
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*[ping() for _ in range(min(settings.db_pool_warmup, settings.db_pool_size))])
+
+
+async def bulk_insert(db: AsyncSession, model, rows: List[Dict[str, Any]]) -> List[Any]:
+    """Insert rows in a single executemany INSERT and return their ids in row order.
+
+    Large batches on PostgreSQL with asyncpg are streamed with COPY instead.
+    """
+    if not rows:
+        return []
+    if len(rows) >= settings.db_copy_threshold and db.get_bind().dialect.driver == "asyncpg":
+        return await _copy_rows(db, model.__table__, rows)
+    result = await db.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+    return result.scalars().all()
+
+
+async def _copy_rows(db: AsyncSession, table, rows: List[Dict[str, Any]]) -> List[Any]:
+    """COPY rows into a table on the session's connection and transaction.
+
+    COPY bypasses SQLAlchemy, so Python-side column defaults are applied and
+    JSON values encoded here. Columns with neither a value nor a Python
+    default are left to the database.
+    """
+    columns = [c for c in table.columns if c.key in rows[0] or c.default is not None]
+    # Resolve dialect variants: a JSON column may be a native ARRAY here
+    dialect = db.get_bind().dialect
+    json_keys = {c.key for c in columns if isinstance(c.type.dialect_impl(dialect), JSON)}
+    records = []
+    for row in rows:
+        record = []
+        for column in columns:
+            if column.key in row:
+                value = row[column.key]
+            elif column.default.is_callable:
+                value = column.default.arg(None)
+            else:
+                value = column.default.arg
+            if value is not None and column.key in json_keys:
+                value = _json_serializer(value)
+            record.append(value)
+        records.append(tuple(record))
+
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=[c.name for c in columns]
+    )
+    id_index = next(i for i, c in enumerate(columns) if c.key == "id")
+    return [record[id_index] for record in records]
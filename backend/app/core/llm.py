@@ -1,8 +1,47 @@
 """LLM configuration with multi-provider support."""
 
+import asyncio
 from functools import lru_cache
+from typing import Any, AsyncIterator, Dict
+import weakref
+import httpx
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+from langchain_core.runnables import Runnable
 from app.core.config import settings
+from app.core.retry import llm_retry
+
+# Caps in-flight LLM requests across all agents and concurrent analyses;
+# size it to the provider's rate limit (or OLLAMA_NUM_PARALLEL for Ollama).
+# One per event loop, as a semaphore binds to the loop it is first used in
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def llm_semaphore() -> asyncio.Semaphore:
+    """Get the running event loop's LLM concurrency semaphore."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(settings.llm_concurrency)
+    return semaphore
+
+
+@lru_cache()
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client used by LLM providers that accept one."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+        ),
+    )
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, if one was created; called at shutdown."""
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
 
 
 @lru_cache()
@@ -16,6 +55,7 @@ def get_llm(temperature: float = 0.1) -> BaseChatModel:
             api_key=settings.openai_api_key,
             model=settings.openai_model,
             temperature=temperature,
+            http_async_client=get_http_client(),
         )
     elif provider == "anthropic":
         from langchain_anthropic import ChatAnthropic
@@ -42,6 +82,7 @@ def get_llm(temperature: float = 0.1) -> BaseChatModel:
         raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
+@lru_cache()
 def get_embeddings():
     """Get embeddings model."""
     provider = settings.llm_provider.lower()
@@ -54,3 +95,38 @@ def get_embeddings():
     else:
         from langchain_openai import OpenAIEmbeddings
         return OpenAIEmbeddings(api_key=settings.openai_api_key)
+
+
+def system_message(text: str) -> SystemMessage:
+    """Build a static system message that providers can serve from prompt cache.
+
+    OpenAI caches long identical prefixes automatically; Anthropic only caches
+    blocks explicitly marked with cache_control.
+    """
+    if settings.llm_provider.lower() == "anthropic":
+        return SystemMessage(content=[
+            {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+        ])
+    return SystemMessage(content=text)
+
+
+@llm_retry
+async def invoke_chain(chain: Runnable, payload: Dict[str, Any]) -> Any:
+    """Invoke an LLM chain, waiting for a free concurrency slot.
+
+    Transient failures are retried with jittered backoff. Each attempt takes
+    its own slot, so a backing-off call doesn't hold one while it sleeps.
+    """
+    async with llm_semaphore():
+        return await chain.ainvoke(payload)
+
+
+async def stream_chain(chain: Runnable, payload: Dict[str, Any]) -> AsyncIterator[Any]:
+    """Stream an LLM chain, holding a concurrency slot until the stream ends.
+
+    Not retried: chunks may already have been consumed when a failure occurs,
+    so callers retry the whole stream with app.core.retry.llm_retrying.
+    """
+    async with llm_semaphore():
+        async for chunk in chain.astream(payload):
+            yield chunk
@@ -0,0 +1,153 @@
+"""LLM response cache with exact and optional semantic matching."""
+
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+
+from app.core.config import settings
+from app.core.llm import get_llm, get_embeddings
+
+
+def _cache_key(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+
+
+def _split_prompt(prompt: str) -> Tuple[str, str]:
+    """Split a serialized chat prompt into (static prefix, human text)."""
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return "", prompt
+    if not isinstance(messages, list):
+        return "", prompt
+
+    prefix, human = [], []
+    for message in messages:
+        kwargs = message.get("kwargs", {}) if isinstance(message, dict) else {}
+        content = kwargs.get("content", "")
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True)
+        (human if kwargs.get("type") == "human" else prefix).append(content)
+    return "\n".join(prefix), "\n".join(human)
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class LLMCache(BaseCache):
+    """In-memory LLM response cache with TTL and LRU eviction.
+
+    Entries are keyed by a SHA-256 of the model configuration (model name,
+    temperature, ...) and the rendered prompt, which already carries the
+    parser's format instructions. When an embeddings model is given, an exact
+    miss falls back to comparing the human message against entries that share
+    the same model and system prompt.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_entries: int = 1024,
+        embeddings: Optional[Embeddings] = None,
+        similarity_threshold: float = 0.92,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, Tuple[float, RETURN_VAL_TYPE]]" = OrderedDict()
+        self._vectors: Dict[str, Dict[str, List[float]]] = {}
+        self._pending: Dict[str, Tuple[str, List[float]]] = {}
+
+    def _get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: RETURN_VAL_TYPE) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        return self._get(_cache_key(llm_string, prompt))
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self._set(_cache_key(llm_string, prompt), return_val)
+
+    def clear(self, **kwargs) -> None:
+        self._entries.clear()
+        self._vectors.clear()
+        self._pending.clear()
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = _cache_key(llm_string, prompt)
+        value = self._get(key)
+        if value is not None or self.embeddings is None:
+            return value
+
+        prefix, human = _split_prompt(prompt)
+        scope = _cache_key(llm_string, prefix)
+        vector = await self.embeddings.aembed_query(human)
+        self._pending[key] = (scope, vector)
+        if len(self._pending) > self.max_entries:
+            del self._pending[next(iter(self._pending))]
+
+        best_key, best_score = None, self.similarity_threshold
+        for candidate, candidate_vector in list(self._vectors.get(scope, {}).items()):
+            if candidate not in self._entries:
+                del self._vectors[scope][candidate]
+                continue
+            score = _cosine(vector, candidate_vector)
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        return self._get(best_key) if best_key else None
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = _cache_key(llm_string, prompt)
+        self._set(key, return_val)
+        pending = self._pending.pop(key, None)
+        if pending:
+            scope, vector = pending
+            self._vectors.setdefault(scope, {})[key] = vector
+
+    async def aclear(self, **kwargs) -> None:
+        self.clear()
+
+
+@lru_cache()
+def get_llm_cache() -> LLMCache:
+    """Get the process-wide LLM response cache."""
+    return LLMCache(
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        max_entries=settings.llm_cache_max_entries,
+        embeddings=get_embeddings() if settings.llm_cache_semantic else None,
+        similarity_threshold=settings.llm_cache_similarity_threshold,
+    )
+
+
+@lru_cache()
+def get_cached_llm(temperature: float = 0.1) -> BaseChatModel:
+    """Get LLM instance with response caching enabled."""
+    llm = get_llm(temperature)
+    if not settings.llm_cache_enabled:
+        return llm
+    return llm.model_copy(update={"cache": get_llm_cache()})
@@ -0,0 +1,31 @@
+"""Output parsers for structured LLM responses."""
+
+import re
+from typing import Any, List
+
+import orjson
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.outputs import Generation
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+class OrjsonOutputParser(JsonOutputParser):
+    """JSON output parser that decodes complete responses with orjson.
+
+    Returns plain dicts; callers validate them into their pydantic models.
+    Partial (streamed) output and responses that are not a bare JSON document,
+    such as JSON wrapped in prose, fall back to the LangChain implementation.
+    """
+
+    def parse_result(self, result: List[Generation], *, partial: bool = False) -> Any:
+        if not partial:
+            text = result[0].text.strip()
+            match = _CODE_FENCE.match(text)
+            if match:
+                text = match.group(1)
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse_result(result, partial=partial)
@@ -0,0 +1,60 @@
+"""Retry policy for transient LLM provider failures."""
+
+import logging
+from typing import Optional
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+logger = logging.getLogger(__name__)
+
+# Timeouts, conflicts, rate limits and server errors are worth retrying;
+# other 4xx responses will fail the same way again
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether an LLM call failure is likely to succeed on retry.
+
+    Provider SDKs wrap httpx errors in their own exception types, so the
+    status code is read from the exception and the cause chain is followed.
+    """
+    while exc is not None:
+        if isinstance(exc, (httpx.TransportError, TimeoutError)):
+            return True
+        status = _status_code(exc)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES or status >= 500
+        exc = exc.__cause__
+    return False
+
+
+_RETRY_POLICY = dict(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_random_exponential(min=1, max=16),
+    stop=stop_after_attempt(4),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+
+llm_retry = retry(**_RETRY_POLICY)
+
+
+def llm_retrying() -> AsyncRetrying:
+    """Retry loop with the LLM policy, for calls that can't be decorated."""
+    return AsyncRetrying(**_RETRY_POLICY)
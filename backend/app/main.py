@@ -1,18 +1,35 @@
 """FastAPI application entry point."""
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, maintain_partitions, warmup_db
+from app.core.llm import close_http_client
+from app.agents import get_orchestrator
 from app.api import gaps_router, faqs_router, content_router, analysis_router
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await warmup_db()
+    # Import the LLM provider and build the agents now rather than on the
+    # first request; a misconfigured provider still fails at request time
+    try:
+        get_orchestrator()
+    except Exception as e:
+        logger.warning("LLM warmup failed: %s", e)
+    partitions = asyncio.create_task(maintain_partitions())
     yield
+    partitions.cancel()
+    await close_http_client()
 
 
 app = FastAPI(
@@ -20,6 +37,7 @@ app = FastAPI(
     description="AI-powered knowledge gap detection, FAQ generation, and content optimization",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -1,6 +1,7 @@
 """Content models."""
 
 from datetime import datetime
+from uuid import UUID
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from enum import Enum
@@ -16,7 +17,7 @@ class ContentType(str, Enum):
 
 class Content(BaseModel):
     """Knowledge base content model."""
-    id: str
+    id: UUID
     title: str
     content: str
     content_type: ContentType
@@ -35,7 +36,7 @@ class Content(BaseModel):
 class ContentSuggestion(BaseModel):
     """Content suggestion for addressing gaps."""
     id: str
-    gap_id: str
+    gap_id: UUID
     title: str
     outline: List[str] = Field(default_factory=list)
     summary: str
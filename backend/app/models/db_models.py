@@ -1,93 +1,217 @@
 """SQLAlchemy database models."""
 
 from datetime import datetime
+import struct
+from typing import Any, Dict, List, Optional
 import uuid
-from sqlalchemy import Column, String, DateTime, Text, Integer, Float, JSON, Enum as SQLEnum
-from app.core.database import Base
+from sqlalchemy import DDL, Column, Computed, ForeignKey, PrimaryKeyConstraint, String, event, Table, text, DateTime, Text, Integer, Float, JSON, Index, LargeBinary, TypeDecorator, Uuid, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.expression import FunctionElement
+from pgvector.sqlalchemy import Vector
+from app.core.config import settings
+from app.core.database import Base, utcnow, uuid7
+from app.models.content import ContentType
+from app.models.faq import FAQStatus
+from app.models.gap import GapPriority, GapSource, GapStatus
 
+class HalfFloatVector(TypeDecorator):
+    """List of floats stored as packed little-endian float16 bytes.
 
-def generate_uuid() -> str:
-    return str(uuid.uuid4())
+    Two bytes per dimension instead of ~15 as JSON text; embeddings lose
+    nothing that matters for cosine similarity.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return struct.pack(f"<{len(value)}e", *value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return list(struct.unpack(f"<{len(value) // 2}e", value))
+
+
+# Native text[], binary JSONB and pgvector on PostgreSQL; JSON text and
+# float16 blobs elsewhere
+StringList = JSON().with_variant(ARRAY(String), "postgresql")
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+Embedding = HalfFloatVector().with_variant(Vector(settings.embedding_dimensions), "postgresql")
+
+
+class empty_string_list(FunctionElement):
+    """Server default for an empty StringList: '{}' for a PostgreSQL array, '[]' JSON elsewhere."""
+    inherit_cache = True
+
+
+@compiles(empty_string_list)
+def _empty_string_list_json(element, compiler, **kw):
+    return "'[]'"
+
+
+@compiles(empty_string_list, "postgresql")
+def _empty_string_list_array(element, compiler, **kw):
+    return "'{}'"
+
+
+def _not_postgresql(ddl, target, bind, dialect, **kw) -> bool:
+    return dialect.name != "postgresql"
+
+
+def _enum(enum_cls, name: str) -> SQLEnum:
+    """Column type storing an enum's values; a native ENUM type on PostgreSQL."""
+    return SQLEnum(enum_cls, name=name, values_callable=lambda members: [m.value for m in members])
+
+
+# Content related to a gap, as a joinable association rather than a JSON list
+gap_content = Table(
+    "gap_content",
+    Base.metadata,
+    Column("gap_id", Uuid, ForeignKey("gaps.id", ondelete="CASCADE"), primary_key=True),
+    Column("content_id", Uuid, ForeignKey("content.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_gap_content_content", "content_id"),
+)
 
 
 class GapDB(Base):
     """Gap database model."""
     __tablename__ = "gaps"
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    title = Column(String, nullable=False)
-    description = Column(Text, nullable=False)
-    topic = Column(String, nullable=False, index=True)
-    priority = Column(String, default="medium")
-    status = Column(String, default="identified")
-    source = Column(String, nullable=False)
-    evidence = Column(JSON, default=list)
-    search_queries = Column(JSON, default=list)
-    ticket_count = Column(Integer, default=0)
-    impact_score = Column(Float, default=0.0)
-    suggested_content = Column(Text, nullable=True)
-    related_content_ids = Column(JSON, default=list)
-    tags = Column(JSON, default=list)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid7)
+    title: Mapped[str] = mapped_column(String)
+    description: Mapped[str] = mapped_column(Text)
+    topic: Mapped[str] = mapped_column(String, index=True)
+    priority: Mapped[GapPriority] = mapped_column(_enum(GapPriority, "gap_priority"), default=GapPriority.MEDIUM)
+    status: Mapped[GapStatus] = mapped_column(_enum(GapStatus, "gap_status"), default=GapStatus.IDENTIFIED)
+    source: Mapped[GapSource] = mapped_column(_enum(GapSource, "gap_source"))
+    evidence: Mapped[List[Any]] = mapped_column(JSONDocument, server_default=text("'[]'"))
+    search_queries: Mapped[List[str]] = mapped_column(StringList, server_default=empty_string_list())
+    ticket_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    impact_score: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
+    suggested_content: Mapped[Optional[str]] = mapped_column(Text)
+    tags: Mapped[List[str]] = mapped_column(StringList, server_default=empty_string_list())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
+
+    # Never lazy-loaded: queries that need it use selectinload()
+    related_content: Mapped[List["ContentDB"]] = relationship(
+        secondary=gap_content, lazy="raise", passive_deletes=True
+    )
 
 
 class FAQDB(Base):
     """FAQ database model."""
     __tablename__ = "faqs"
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    question = Column(Text, nullable=False)
-    answer = Column(Text, nullable=False)
-    category = Column(String, nullable=False, index=True)
-    status = Column(String, default="draft")
-    source_tickets = Column(JSON, default=list)
-    source_queries = Column(JSON, default=list)
-    confidence_score = Column(Float, default=0.0)
-    view_count = Column(Integer, default=0)
-    helpful_count = Column(Integer, default=0)
-    not_helpful_count = Column(Integer, default=0)
-    related_faqs = Column(JSON, default=list)
-    tags = Column(JSON, default=list)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    published_at = Column(DateTime, nullable=True)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid7)
+    question: Mapped[str] = mapped_column(Text)
+    answer: Mapped[str] = mapped_column(Text)
+    category: Mapped[str] = mapped_column(String)
+    status: Mapped[FAQStatus] = mapped_column(_enum(FAQStatus, "faq_status"), default=FAQStatus.DRAFT)
+    source_tickets: Mapped[List[str]] = mapped_column(StringList, server_default=empty_string_list())
+    source_queries: Mapped[List[str]] = mapped_column(StringList, server_default=empty_string_list())
+    confidence_score: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
+    view_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    helpful_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    not_helpful_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    helpfulness_ratio: Mapped[Optional[float]] = mapped_column(Float, Computed(
+        "CASE WHEN helpful_count + not_helpful_count > 0 "
+        "THEN CAST(helpful_count AS DOUBLE PRECISION) / (helpful_count + not_helpful_count) END",
+        persisted=True
+    ))
+    related_faqs: Mapped[List[str]] = mapped_column(StringList, server_default=empty_string_list())
+    tags: Mapped[List[str]] = mapped_column(StringList, server_default=empty_string_list())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
+    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
 
 class ContentDB(Base):
     """Content database model."""
     __tablename__ = "content"
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    title = Column(String, nullable=False)
-    content = Column(Text, nullable=False)
-    content_type = Column(String, nullable=False)
-    url = Column(String, nullable=True)
-    category = Column(String, nullable=False, index=True)
-    tags = Column(JSON, default=list)
-    view_count = Column(Integer, default=0)
-    search_hits = Column(Integer, default=0)
-    helpful_votes = Column(Integer, default=0)
-    freshness_score = Column(Float, default=1.0)
-    completeness_score = Column(Float, default=0.0)
-    embedding = Column(JSON, nullable=True)
-    last_updated = Column(DateTime, default=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid7)
+    title: Mapped[str] = mapped_column(String)
+    content: Mapped[str] = mapped_column(Text)
+    content_type: Mapped[ContentType] = mapped_column(_enum(ContentType, "content_type"))
+    url: Mapped[Optional[str]] = mapped_column(String)
+    category: Mapped[str] = mapped_column(String, index=True)
+    tags: Mapped[List[str]] = mapped_column(StringList, server_default=empty_string_list())
+    view_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    search_hits: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    helpful_votes: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    freshness_score: Mapped[Optional[float]] = mapped_column(Float, default=1.0)
+    completeness_score: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
+    embedding: Mapped[Optional[List[float]]] = mapped_column(Embedding)
+    last_updated: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow())
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=utcnow())
 
 
 class AnalysisReportDB(Base):
-    """Analysis report database model."""
+    """Analysis report database model.
+
+    On PostgreSQL the table is range-partitioned by month of created_at
+    (see create_partitions), which needs created_at in the primary key, so
+    there the key is (id, created_at). Elsewhere, and for the ORM, it is id.
+    """
     __tablename__ = "analysis_reports"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", name="analysis_reports_pkey").ddl_if(callable_=_not_postgresql),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, default=uuid7)
+    report_type: Mapped[str] = mapped_column(String)
+    status: Mapped[Optional[str]] = mapped_column(String, default="running")
+    gaps_found: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    faqs_generated: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    suggestions_created: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    coverage_before: Mapped[Optional[float]] = mapped_column(Float)
+    coverage_after: Mapped[Optional[float]] = mapped_column(Float)
+    summary: Mapped[Optional[str]] = mapped_column(Text)
+    details: Mapped[Dict[str, Any]] = mapped_column(JSONDocument, server_default=text("'{}'"))
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+
+# Composite indexes matching the list endpoints' filters and sort order
+Index("ix_gaps_impact", GapDB.impact_score.desc())
+Index("ix_gaps_status_impact", GapDB.status, GapDB.impact_score.desc())
+Index("ix_gaps_status_priority_impact", GapDB.status, GapDB.priority, GapDB.impact_score.desc())
+Index("ix_faqs_status_cat_created", FAQDB.status, FAQDB.category, FAQDB.created_at.desc(), FAQDB.id.desc())
+Index("ix_faqs_cat_created", FAQDB.category, FAQDB.created_at.desc(), FAQDB.id.desc())
+Index("ix_faqs_helpfulness", FAQDB.helpfulness_ratio.desc())
+Index(
+    "ix_content_type_cat_updated",
+    ContentDB.content_type, ContentDB.category, ContentDB.last_updated.desc(), ContentDB.id.desc()
+)
+Index("ix_reports_created", AnalysisReportDB.created_at.desc(), AnalysisReportDB.id.desc())
+event.listen(
+    AnalysisReportDB.__table__,
+    "after_create",
+    DDL("ALTER TABLE %(table)s ADD CONSTRAINT analysis_reports_pkey PRIMARY KEY (id, created_at)")
+    .execute_if(dialect="postgresql"),
+)
+
+# GIN indexes for tag containment and list_gaps' topic ILIKE '%...%' filter
+# (PostgreSQL only)
+Index("ix_gaps_tags_gin", GapDB.tags, postgresql_using="gin").ddl_if(dialect="postgresql")
+Index(
+    "ix_gaps_topic_trgm",
+    GapDB.topic,
+    postgresql_using="gin",
+    postgresql_ops={"topic": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    report_type = Column(String, nullable=False)
-    status = Column(String, default="running")
-    gaps_found = Column(Integer, default=0)
-    faqs_generated = Column(Integer, default=0)
-    suggestions_created = Column(Integer, default=0)
-    coverage_before = Column(Float, nullable=True)
-    coverage_after = Column(Float, nullable=True)
-    summary = Column(Text, nullable=True)
-    details = Column(JSON, default=dict)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    completed_at = Column(DateTime, nullable=True)
+# HNSW index for cosine-distance nearest-neighbour search (PostgreSQL only)
+Index(
+    "ix_content_embedding_hnsw",
+    ContentDB.embedding,
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    postgresql_ops={"embedding": "vector_cosine_ops"},
+).ddl_if(dialect="postgresql")
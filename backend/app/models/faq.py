@@ -1,10 +1,14 @@
 """FAQ models."""
 
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from uuid import UUID
+from typing import TYPE_CHECKING, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
+if TYPE_CHECKING:
+    from app.models.db_models import FAQDB
+
 
 class FAQStatus(str, Enum):
     DRAFT = "draft"
@@ -16,7 +20,7 @@ class FAQStatus(str, Enum):
 
 class FAQ(BaseModel):
     """FAQ model."""
-    id: str
+    id: UUID
     question: str
     answer: str
     category: str
@@ -27,12 +31,36 @@ class FAQ(BaseModel):
     view_count: int = 0
     helpful_count: int = 0
     not_helpful_count: int = 0
+    helpfulness_ratio: Optional[float] = None
     related_faqs: List[str] = Field(default_factory=list)
     tags: List[str] = Field(default_factory=list)
     created_at: datetime
     updated_at: datetime
     published_at: Optional[datetime] = None
 
+    @classmethod
+    def from_db(cls, row: "FAQDB") -> "FAQ":
+        """Build from a database row without re-validating it."""
+        return cls.model_construct(
+            id=row.id,
+            question=row.question,
+            answer=row.answer,
+            category=row.category,
+            status=row.status,
+            source_tickets=row.source_tickets or [],
+            source_queries=row.source_queries or [],
+            confidence_score=row.confidence_score,
+            view_count=row.view_count,
+            helpful_count=row.helpful_count,
+            not_helpful_count=row.not_helpful_count,
+            helpfulness_ratio=row.helpfulness_ratio,
+            related_faqs=row.related_faqs or [],
+            tags=row.tags or [],
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            published_at=row.published_at
+        )
+
 
 class FAQCreate(BaseModel):
     """FAQ creation model."""
@@ -43,5 +71,13 @@ class FAQCreate(BaseModel):
 
 
 class FAQResponse(FAQ):
-    """FAQ response with metadata."""
-    helpfulness_ratio: Optional[float] = None
+    """FAQ response with metadata.
+
+    Frozen: responses are only built and serialized, never mutated.
+    """
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    @field_validator("source_tickets", "source_queries", "related_faqs", "tags", mode="before")
+    @classmethod
+    def _null_list(cls, value):
+        return [] if value is None else value
@@ -1,10 +1,14 @@
 """Gap models."""
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from uuid import UUID
+from typing import TYPE_CHECKING, Annotated, List, Literal, Optional, Union
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter, field_validator
 from enum import Enum
 
+if TYPE_CHECKING:
+    from app.models.db_models import GapDB
+
 
 class GapPriority(str, Enum):
     CRITICAL = "critical"
@@ -29,25 +33,94 @@ class GapSource(str, Enum):
     MANUAL = "manual"
 
 
+class SearchQueryEvidence(BaseModel):
+    """A search query that returned poor or no results."""
+    kind: Literal["search_query"] = "search_query"
+    query: str
+    count: int = 1
+
+
+class TicketEvidence(BaseModel):
+    """A support ticket raised about the gap."""
+    kind: Literal["support_ticket"] = "support_ticket"
+    subject: str
+    ticket_id: Optional[str] = None
+
+
+class FeedbackEvidence(BaseModel):
+    """User feedback pointing at the gap."""
+    kind: Literal["user_feedback"] = "user_feedback"
+    text: str
+
+
+class AnalysisEvidence(BaseModel):
+    """Supporting evidence stated by the gap analysis."""
+    kind: Literal["analysis"] = "analysis"
+    text: str
+
+
+def text_evidence(items):
+    """Wrap bare evidence strings, as the gap detector returns them, as analysis evidence."""
+    if not isinstance(items, list):
+        return items
+    return [{"kind": "analysis", "text": item} if isinstance(item, str) else item for item in items]
+
+
+# Tagged on "kind" so validation dispatches straight to one variant
+Evidence = Annotated[
+    Union[SearchQueryEvidence, TicketEvidence, FeedbackEvidence, AnalysisEvidence],
+    Field(discriminator="kind")
+]
+EvidenceList = Annotated[List[Evidence], BeforeValidator(text_evidence)]
+_EVIDENCE_ADAPTER = TypeAdapter(EvidenceList)
+
+
 class Gap(BaseModel):
     """Knowledge gap model."""
-    id: str
+    id: UUID
     title: str
     description: str
     topic: str
     priority: GapPriority = GapPriority.MEDIUM
     status: GapStatus = GapStatus.IDENTIFIED
     source: GapSource
-    evidence: List[Dict[str, Any]] = Field(default_factory=list)
+    evidence: EvidenceList = Field(default_factory=list)
     search_queries: List[str] = Field(default_factory=list)
     ticket_count: int = 0
     impact_score: float = 0.0
     suggested_content: Optional[str] = None
-    related_content_ids: List[str] = Field(default_factory=list)
+    related_content_ids: List[UUID] = Field(default_factory=list)
     tags: List[str] = Field(default_factory=list)
     created_at: datetime
     updated_at: datetime
 
+    @classmethod
+    def from_db(cls, row: "GapDB") -> "Gap":
+        """Build from a database row without re-validating it.
+
+        Only the JSON evidence column is validated, into its tagged variants.
+        Enum columns already load as enum members. The row's related_content
+        must be loaded.
+        """
+        return cls.model_construct(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            topic=row.topic,
+            priority=row.priority,
+            status=row.status,
+            source=row.source,
+            evidence=_EVIDENCE_ADAPTER.validate_python(row.evidence or []),
+            search_queries=row.search_queries or [],
+            ticket_count=row.ticket_count,
+            impact_score=row.impact_score,
+            suggested_content=row.suggested_content,
+            related_content_ids=[content.id for content in row.related_content],
+            tags=row.tags or [],
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+
 
 class GapCreate(BaseModel):
     """Gap creation model."""
@@ -57,8 +130,17 @@ class GapCreate(BaseModel):
     priority: GapPriority = GapPriority.MEDIUM
     source: GapSource = GapSource.MANUAL
     tags: List[str] = Field(default_factory=list)
+    related_content_ids: List[UUID] = Field(default_factory=list)
 
 
 class GapResponse(Gap):
-    """Gap response with metadata."""
-    pass
+    """Gap response with metadata.
+
+    Frozen: responses are only built and serialized, never mutated.
+    """
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    @field_validator("evidence", "search_queries", "related_content_ids", "tags", mode="before")
+    @classmethod
+    def _null_list(cls, value):
+        return [] if value is None else value
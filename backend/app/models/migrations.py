@@ -0,0 +1,219 @@
+"""Schema upgrades for databases created by earlier versions.
+
+init_db's create_all only creates missing tables. An existing table whose
+schema has fallen behind its model is rebuilt instead: its rows are read,
+the table is dropped and created from the model, and the rows are copied
+back converted to the current column types. Tables with foreign keys to a
+rebuilt table are rebuilt along with it. Tables matching their model are
+left alone, so this does nothing once applied.
+"""
+
+from datetime import datetime, timezone
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Set
+import uuid
+
+import orjson
+from sqlalchemy import JSON, Column, DateTime, MetaData, String, Table, Uuid, cast, inspect, insert, select, text, Enum as SQLEnum
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.types import CHAR, UUID
+
+from app.core.database import Base, _create_month_partitions, is_partitioned
+from app.models.db_models import ContentDB, gap_content
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_db(conn: AsyncConnection) -> None:
+    """Rebuild out-of-date tables; called by init_db before create_all."""
+    unpartitioned = set()
+    if conn.dialect.name == "postgresql":
+        for table in Base.metadata.sorted_tables:
+            if table.dialect_options["postgresql"]["partition_by"] and not await is_partitioned(conn, table):
+                unpartitioned.add(table.name)
+    stale = await conn.run_sync(_stale_tables, unpartitioned)
+    if not stale:
+        return
+    # pysqlite only opens a transaction before DML, so without a SAVEPOINT
+    # SQLite would run the DROPs outside the caller's transaction
+    async with conn.begin_nested():
+        dropped = await _rebuild(conn, stale)
+        related = {
+            gap_id: columns["related_content_ids"]
+            for gap_id, columns in dropped.get("gaps", {}).items()
+            if columns.get("related_content_ids")
+        }
+        if related:
+            await _move_related_content_ids(conn, related)
+
+
+def _stale_tables(conn: Connection, unpartitioned: Set[str] = frozenset()) -> List[Table]:
+    """Existing tables to rebuild, in dependency order.
+
+    unpartitioned names PostgreSQL tables the model partitions but that
+    were created as plain tables.
+    """
+    inspector = inspect(conn)
+    existing = set(inspector.get_table_names())
+    stale = set()
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        if table.name in unpartitioned:
+            reason = "not partitioned"
+        else:
+            reason = _stale_reason(table, inspector.get_columns(table.name))
+        if reason:
+            logger.info("Rebuilding table %s: %s", table.name, reason)
+            stale.add(table)
+    # Referenced tables sort first, so one pass also catches chains
+    for table in Base.metadata.sorted_tables:
+        if table.name in existing and any(fk.column.table in stale for fk in table.foreign_keys):
+            stale.add(table)
+    return [table for table in Base.metadata.sorted_tables if table in stale]
+
+
+def _stale_reason(table: Table, live_columns: List[Dict[str, Any]]) -> Optional[str]:
+    live = {column["name"]: column for column in live_columns}
+    removed = live.keys() - table.columns.keys()
+    if removed:
+        return f"column(s) {', '.join(sorted(removed))} removed"
+    # Added columns can't always be ALTERed in: SQLite only adds generated
+    # columns as VIRTUAL, and helpfulness_ratio is STORED
+    added = table.columns.keys() - live.keys()
+    if added:
+        return f"column(s) {', '.join(sorted(added))} added"
+    for column in table.columns:
+        found = live[column.name]
+        if isinstance(column.type, Uuid) and not _stores_uuid(found["type"]):
+            return f"{column.name} stored as text"
+        if column.server_default is not None and column.computed is None and found.get("default") is None:
+            return f"{column.name} has no server default"
+    return None
+
+
+def _stores_uuid(type_) -> bool:
+    # Uuid is native UUID on PostgreSQL and CHAR(32) hex elsewhere; earlier
+    # versions stored str(uuid4()) in VARCHAR
+    return isinstance(type_, UUID) or (isinstance(type_, CHAR) and type_.length == 32)
+
+
+async def _rebuild(conn: AsyncConnection, tables: List[Table]) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+    """Recreate tables from their models, keeping their rows.
+
+    Rows are held in memory while the tables are recreated. Returns, per
+    table, the values of columns the model no longer has, keyed by row id.
+    """
+    saved = []
+    for table in tables:
+        old = await conn.run_sync(lambda sync_conn: Table(table.name, MetaData(), autoload_with=sync_conn))
+        saved.append((table, (await conn.execute(select(old))).mappings().all()))
+
+    for table in reversed(tables):
+        await conn.execute(text(f"DROP TABLE {table.name}"))
+    await conn.run_sync(Base.metadata.create_all, tables=tables)
+
+    dropped = {}
+    for table, rows in saved:
+        if conn.dialect.name == "postgresql" and table.dialect_options["postgresql"]["partition_by"]:
+            await _create_month_partitions(conn, table)
+        values = [_convert_row(table, row) for row in rows]
+        if values:
+            await conn.execute(insert(table), values)
+        if "id" in table.c:
+            dropped[table.name] = {
+                new["id"]: {key: value for key, value in row.items() if key not in table.c}
+                for new, row in zip(values, rows)
+            }
+        logger.info("Rebuilt table %s with %d rows", table.name, len(values))
+    return dropped
+
+
+def _convert_row(table: Table, row: Mapping[str, Any]) -> Dict[str, Any]:
+    # Columns the old table lacks are left out, so their defaults apply
+    return {
+        column.key: _convert_value(column, row[column.name])
+        for column in table.columns
+        if column.computed is None and column.name in row
+    }
+
+
+def _convert_value(column: Column, value: Any) -> Any:
+    if value is None:
+        return None if column.nullable else _not_null_value(column)
+    if isinstance(column.type, Uuid):
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    if isinstance(column.type, SQLEnum):
+        return _enum_member(column, value)
+    return value
+
+
+def _not_null_value(column: Column) -> Any:
+    """Stand-in for a NULL in a column that is now NOT NULL."""
+    if column.default is not None and column.default.is_scalar:
+        return column.default.arg
+    if isinstance(column.type, DateTime):
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+    if isinstance(column.type, JSON):
+        # details defaults to an empty object, the list columns to []
+        default = getattr(column.server_default, "arg", None)
+        return {} if getattr(default, "text", None) == "'{}'" else []
+    return None
+
+
+def _enum_member(column: Column, value: Any) -> Any:
+    enum_class = column.type.enum_class
+    for candidate in (value, str(value).lower()):
+        try:
+            return enum_class(candidate)
+        except ValueError:
+            pass
+    if column.default is not None and column.default.is_scalar:
+        logger.warning("Replacing unknown %s value %r with %r", column, value, column.default.arg.value)
+        return column.default.arg
+    return value
+
+
+def _parse_ids(value: Any) -> List[uuid.UUID]:
+    # A JSON string on SQLite, a text[] array on PostgreSQL
+    if isinstance(value, str):
+        value = orjson.loads(value)
+    ids = []
+    for item in value or []:
+        try:
+            ids.append(uuid.UUID(str(item)))
+        except ValueError:
+            pass
+    return ids
+
+
+async def _move_related_content_ids(conn: AsyncConnection, related: Dict[uuid.UUID, Any]) -> None:
+    """Copy the old gaps.related_content_ids lists into gap_content.
+
+    Runs after the rebuild, so content ids are stored in their current form.
+    Ids of content that no longer exists are dropped. An id that looks
+    missing but matches a stored id once both are normalised aborts the
+    upgrade, so the old lists are never dropped for a lookup mismatch.
+    """
+    await conn.run_sync(gap_content.create, checkfirst=True)
+    parsed = {gap_id: set(_parse_ids(content_ids)) for gap_id, content_ids in related.items()}
+
+    wanted = {content_id for ids in parsed.values() for content_id in ids}
+    existing = set()
+    if wanted:
+        existing = set((await conn.execute(select(ContentDB.id).where(ContentDB.id.in_(wanted)))).scalars())
+    missing = wanted - existing
+    if missing:
+        stored = (await conn.execute(select(cast(ContentDB.id, String)))).scalars()
+        if missing & {uuid.UUID(content_id) for content_id in stored}:
+            raise RuntimeError("Related content ids did not match stored content ids; gaps table left unchanged")
+        logger.warning("Dropping %d related content ids of content that no longer exists", len(missing))
+    links = [
+        {"gap_id": gap_id, "content_id": content_id}
+        for gap_id, ids in parsed.items()
+        for content_id in ids if content_id in existing
+    ]
+    if links:
+        await conn.execute(insert(gap_content), links)
+    logger.info("Moved %d gap-content links from gaps.related_content_ids to gap_content", len(links))
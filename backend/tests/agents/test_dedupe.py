@@ -0,0 +1,24 @@
+"""Lexical merging of duplicate search queries."""
+
+from app.agents._dedupe import merge_queries
+from app.agents._render import Query, freeze_queries
+
+
+def test_counts_are_summed_into_most_frequent_phrasing():
+    queries = freeze_queries([
+        {"query": "Reset password?", "count": 2},
+        {"query": "reset  password", "count": 5},
+        {"query": "Billing", "count": 4},
+    ])
+    assert merge_queries(queries) == (Query("reset  password", 7), Query("Billing", 4))
+
+
+def test_missing_and_odd_counts_count_once():
+    queries = freeze_queries([
+        {"query": "Reset password?"},
+        {"query": "reset password", "count": None},
+        {"query": "RESET PASSWORD", "count": "3"},
+        {"query": "Billing", "count": "many"},
+        {"query": "Export", "count": 0},
+    ])
+    assert merge_queries(queries) == (Query("RESET PASSWORD", 5), Query("Billing", 1), Query("Export", 1))
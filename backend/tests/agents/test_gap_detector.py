@@ -0,0 +1,43 @@
+"""Streaming gap detection with retries."""
+
+import httpx
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt
+
+from app.agents.gap_detector import GapDetectorAgent
+
+
+def gap(title: str) -> dict:
+    return {
+        "title": title, "description": "-", "topic": "account", "priority": "high",
+        "evidence": [], "search_queries": [], "impact_score": 0.5, "suggested_content": "-",
+    }
+
+
+async def test_retry_restarts_reported_gaps(monkeypatch):
+    attempts = [
+        [gap("Stale"), gap("Other")],  # fails after reporting Stale
+        [gap("Fresh"), gap("Other")],
+    ]
+
+    async def stream_chain(chain, payload):
+        gaps = attempts.pop(0)
+        for i in range(1, len(gaps) + 1):
+            yield {"gaps": gaps[:i]}
+        if attempts:
+            raise httpx.ConnectError("connection reset")
+
+    monkeypatch.setattr("app.agents.gap_detector.stream_chain", stream_chain)
+    monkeypatch.setattr("app.agents.gap_detector.llm_retrying", lambda: AsyncRetrying(
+        retry=retry_if_exception_type(httpx.TransportError), stop=stop_after_attempt(2), reraise=True
+    ))
+    detector = GapDetectorAgent.__new__(GapDetectorAgent)  # the chain is stubbed, so no LLM
+    events = []
+
+    result = await detector._stream_gaps(
+        None, {},
+        on_gap=lambda detected: events.append(detected.title),
+        on_restart=lambda: events.append("restart"),
+    )
+
+    assert events == ["Stale", "restart", "Fresh", "Other"]
+    assert [detected.title for detected in result["gaps"]] == ["Fresh", "Other"]
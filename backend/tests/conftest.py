@@ -0,0 +1,36 @@
+"""Shared fixtures. Tests run against a throwaway SQLite database."""
+
+import glob
+import os
+import tempfile
+
+from httpx import ASGITransport, AsyncClient
+import pytest
+
+# Settings are read at import time, so configure them before importing app
+DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+# Each test has its own database, so responses must not outlive it
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+from app.core.database import engine, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture
+async def database():
+    """An empty database, deleted after the test."""
+    yield engine
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+    for path in glob.glob(DB_PATH + "*"):
+        os.remove(path)
+
+
+@pytest.fixture
+async def client(database):
+    """HTTP client for the app, on an initialised database."""
+    await init_db()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
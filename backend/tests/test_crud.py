@@ -0,0 +1,80 @@
+"""Shared list and CRUD helpers, exercised through the FAQ routes."""
+
+from sqlalchemy import select, update
+
+from app.api._crud import execute_or_404
+from app.core.database import AsyncSessionLocal, bulk_insert
+from app.models.db_models import FAQDB
+
+
+def faq_rows(count: int):
+    return [
+        {"question": f"Question {i}?", "answer": "-", "category": "account"}
+        for i in range(count)
+    ]
+
+
+async def test_keyset_pages_cover_every_row_once(client):
+    async with AsyncSessionLocal() as db:
+        # One multi-row INSERT: on SQLite the rows share created_at, so only
+        # the id separates them
+        await bulk_insert(db, FAQDB, faq_rows(7))
+        await db.commit()
+    everything = (await client.get("/api/faqs")).json()
+
+    pages, params = [], {"limit": 3}
+    while True:
+        page = (await client.get("/api/faqs", params=params)).json()
+        if not page:
+            break
+        pages.append(page)
+        params = {"limit": 3, "before": page[-1]["created_at"], "before_id": page[-1]["id"]}
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [faq["id"] for page in pages for faq in page] == [faq["id"] for faq in everything]
+
+
+async def test_aware_cursor_is_read_as_utc(client):
+    async with AsyncSessionLocal() as db:
+        await bulk_insert(db, FAQDB, faq_rows(4))
+        await db.commit()
+    first = (await client.get("/api/faqs", params={"limit": 2})).json()
+    last = first[-1]
+
+    naive = await client.get("/api/faqs", params={"before": last["created_at"], "before_id": last["id"]})
+    aware = await client.get(
+        "/api/faqs", params={"before": last["created_at"] + "+00:00", "before_id": last["id"]}
+    )
+    assert len(naive.json()) == 2
+    assert aware.json() == naive.json()
+
+
+async def test_execute_or_404_commits_a_matched_row(client):
+    async with AsyncSessionLocal() as db:
+        [faq_id] = await bulk_insert(db, FAQDB, faq_rows(1))
+        await db.commit()
+        await execute_or_404(
+            db, update(FAQDB).where(FAQDB.id == faq_id).values(view_count=5).returning(FAQDB.id),
+            "faqs", "FAQ not found"
+        )
+    async with AsyncSessionLocal() as db:
+        assert await db.scalar(select(FAQDB.view_count).where(FAQDB.id == faq_id)) == 5
+
+
+async def test_delete_then_404(client):
+    async with AsyncSessionLocal() as db:
+        [faq_id] = await bulk_insert(db, FAQDB, faq_rows(1))
+        await db.commit()
+
+    deleted = await client.delete(f"/api/faqs/{faq_id}")
+    assert deleted.json() == {"deleted": True, "faq_id": str(faq_id)}
+    missing = await client.delete(f"/api/faqs/{faq_id}")
+    assert missing.status_code == 404
+    assert missing.json() == {"detail": "FAQ not found"}
+    assert (await client.get(f"/api/faqs/{faq_id}")).status_code == 404
+
+
+async def test_invalid_id_is_reported_under_the_resource_name(client):
+    response = await client.get("/api/faqs/not-a-uuid")
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["path", "faq_id"]
@@ -0,0 +1,26 @@
+"""Database helpers."""
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal, bulk_insert, init_db
+from app.models.db_models import GapDB
+from app.models.gap import GapSource
+
+
+async def test_bulk_insert_returns_ids_in_row_order(database):
+    await init_db()
+    titles = [f"Gap {i}" for i in range(25)][::-1]
+    async with AsyncSessionLocal() as db:
+        ids = await bulk_insert(db, GapDB, [
+            {"title": title, "description": "-", "topic": "account", "source": GapSource.MANUAL}
+            for title in titles
+        ])
+        await db.commit()
+        stored = dict((await db.execute(select(GapDB.id, GapDB.title))).all())
+
+    assert [stored[gap_id] for gap_id in ids] == titles
+
+
+async def test_bulk_insert_of_nothing(database):
+    async with AsyncSessionLocal() as db:
+        assert await bulk_insert(db, GapDB, []) == []
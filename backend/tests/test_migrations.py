@@ -0,0 +1,145 @@
+"""Upgrading databases created by earlier versions."""
+
+import uuid
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.orm import selectinload
+
+from app.core.database import AsyncSessionLocal, init_db
+from app.models.db_models import AnalysisReportDB, ContentDB, FAQDB, GapDB
+from app.models.gap import GapPriority, GapSource, GapStatus
+from app.models.migrations import _stale_tables
+
+# Tables as the first release created them on SQLite: text ids and plain
+# JSON columns with Python-side defaults
+BASELINE_SCHEMA = [
+    """CREATE TABLE gaps (
+        id VARCHAR NOT NULL, title VARCHAR NOT NULL, description TEXT NOT NULL,
+        topic VARCHAR NOT NULL, priority VARCHAR, status VARCHAR, source VARCHAR NOT NULL,
+        evidence JSON, search_queries JSON, ticket_count INTEGER, impact_score FLOAT,
+        suggested_content TEXT, related_content_ids JSON, tags JSON,
+        created_at DATETIME, updated_at DATETIME, PRIMARY KEY (id))""",
+    "CREATE INDEX ix_gaps_topic ON gaps (topic)",
+    """CREATE TABLE faqs (
+        id VARCHAR NOT NULL, question TEXT NOT NULL, answer TEXT NOT NULL,
+        category VARCHAR NOT NULL, status VARCHAR, source_tickets JSON, source_queries JSON,
+        confidence_score FLOAT, view_count INTEGER, helpful_count INTEGER,
+        not_helpful_count INTEGER, related_faqs JSON, tags JSON,
+        created_at DATETIME, updated_at DATETIME, published_at DATETIME, PRIMARY KEY (id))""",
+    "CREATE INDEX ix_faqs_category ON faqs (category)",
+    """CREATE TABLE content (
+        id VARCHAR NOT NULL, title VARCHAR NOT NULL, content TEXT NOT NULL,
+        content_type VARCHAR NOT NULL, url VARCHAR, category VARCHAR NOT NULL, tags JSON,
+        view_count INTEGER, search_hits INTEGER, helpful_votes INTEGER,
+        freshness_score FLOAT, completeness_score FLOAT, embedding JSON,
+        last_updated DATETIME, created_at DATETIME, PRIMARY KEY (id))""",
+    "CREATE INDEX ix_content_category ON content (category)",
+    """CREATE TABLE analysis_reports (
+        id VARCHAR NOT NULL, report_type VARCHAR NOT NULL, status VARCHAR,
+        gaps_found INTEGER, faqs_generated INTEGER, suggestions_created INTEGER,
+        coverage_before FLOAT, coverage_after FLOAT, summary TEXT, details JSON,
+        created_at DATETIME, completed_at DATETIME, PRIMARY KEY (id))""",
+]
+
+GAP_ID = "3f2b8a4e-5c1d-4e7f-9a6b-0c8d2e4f6a1b"
+FAQ_ID = "7a9c1e3b-2d4f-4a6c-8e0b-1f3d5b7a9c2e"
+CONTENT_ID = "c4e6a8b0-1d3f-4b5a-9c7e-2f4a6c8e0b1d"
+REPORT_ID = "e1a3c5b7-9d2f-4e6a-8b0c-4d6f8a0c2e4b"
+
+
+async def create_baseline(engine, related_content_ids: str = "[]") -> None:
+    async with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            await conn.execute(text(statement))
+        await conn.execute(text(
+            "INSERT INTO content (id, title, content, content_type, category, tags, embedding, created_at) "
+            "VALUES (:id, 'Reset your password', 'Steps...', 'guide', 'account', '[\"auth\"]', '[0.5, 0.25]', "
+            "'2024-01-02 03:04:05.000000')"
+        ), {"id": CONTENT_ID})
+        await conn.execute(text(
+            "INSERT INTO gaps (id, title, description, topic, priority, status, source, evidence, "
+            "search_queries, related_content_ids, tags, created_at) "
+            "VALUES (:id, 'Password reset', 'No guide', 'account', 'High', 'identified', 'search_query', "
+            "'[\"reset password\"]', NULL, :related, NULL, '2024-01-02 03:04:05.000000')"
+        ), {"id": GAP_ID, "related": related_content_ids})
+        await conn.execute(text(
+            "INSERT INTO faqs (id, question, answer, category, status, helpful_count, not_helpful_count) "
+            "VALUES (:id, 'How do I reset my password?', 'Use the link.', 'account', 'published', 3, 1)"
+        ), {"id": FAQ_ID})
+        await conn.execute(text(
+            "INSERT INTO analysis_reports (id, report_type, status, details, created_at) "
+            "VALUES (:id, 'full', 'completed', NULL, '2024-01-02 03:04:05.000000')"
+        ), {"id": REPORT_ID})
+
+
+async def test_text_ids_are_rewritten(database):
+    await create_baseline(database)
+    await init_db()
+
+    async with AsyncSessionLocal() as db:
+        gap = await db.get(GapDB, uuid.UUID(GAP_ID))
+        assert gap is not None
+        assert gap.priority is GapPriority.HIGH
+        assert gap.status is GapStatus.IDENTIFIED
+        assert gap.source is GapSource.SEARCH_QUERY
+        assert gap.evidence == ["reset password"]
+        assert gap.search_queries == [] and gap.tags == []
+        assert (await db.get(FAQDB, uuid.UUID(FAQ_ID))) is not None
+        assert (await db.get(AnalysisReportDB, uuid.UUID(REPORT_ID))).details == {}
+        content = await db.get(ContentDB, uuid.UUID(CONTENT_ID))
+        assert content.tags == ["auth"]
+        assert content.embedding == [0.5, 0.25]
+
+
+async def test_new_rows_get_server_defaults(database):
+    await create_baseline(database)
+    await init_db()
+
+    async with AsyncSessionLocal() as db:
+        gap = GapDB(title="Billing", description="-", topic="billing", source=GapSource.MANUAL)
+        db.add(gap)
+        await db.commit()
+        created_at = await db.scalar(select(GapDB.created_at).where(GapDB.id == gap.id))
+        assert created_at is not None
+
+
+async def test_upgrade_runs_once(database):
+    await create_baseline(database)
+    await init_db()
+    await init_db()
+
+    async with database.connect() as conn:
+        assert await conn.run_sync(_stale_tables) == []
+    async with AsyncSessionLocal() as db:
+        assert (await db.scalars(select(GapDB.id))).all() == [uuid.UUID(GAP_ID)]
+
+
+async def test_related_content_ids_become_links(database):
+    gone = str(uuid.uuid4())
+    await create_baseline(database, related_content_ids=f'["{CONTENT_ID}", "{gone}", "not-an-id"]')
+    await init_db()
+
+    async with database.connect() as conn:
+        columns = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns("gaps"))
+        assert "related_content_ids" not in {column["name"] for column in columns}
+    async with AsyncSessionLocal() as db:
+        gap = await db.scalar(
+            select(GapDB).where(GapDB.id == uuid.UUID(GAP_ID)).options(selectinload(GapDB.related_content))
+        )
+        assert [content.id for content in gap.related_content] == [uuid.UUID(CONTENT_ID)]
+
+
+async def test_added_generated_column(database, client):
+    async with database.begin() as conn:
+        # faqs as it was before helpfulness_ratio
+        await conn.execute(text("DROP INDEX ix_faqs_helpfulness"))
+        await conn.execute(text("ALTER TABLE faqs DROP COLUMN helpfulness_ratio"))
+        await conn.execute(text(
+            "INSERT INTO faqs (id, question, answer, category, status, helpful_count, not_helpful_count) "
+            "VALUES (:id, 'How do I reset my password?', 'Use the link.', 'account', 'published', 3, 1)"
+        ), {"id": uuid.UUID(FAQ_ID).hex})
+    await init_db()
+
+    response = await client.get("/api/faqs")
+    assert response.status_code == 200
+    assert [faq["helpfulness_ratio"] for faq in response.json()] == [0.75]
@@ -0,0 +1,69 @@
+"""Monthly partition upkeep, against a recording stand-in for PostgreSQL."""
+
+from contextlib import asynccontextmanager
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.database import _PARTITION_MONTHS, create_partitions, init_db
+from app.models.migrations import _stale_tables
+
+
+class RecordingConnection:
+    """Records statements; answers the pg_partitioned_table lookup."""
+
+    def __init__(self, partitioned: bool):
+        self.partitioned = partitioned
+        self.statements = []
+
+    async def execute(self, statement, parameters=None):
+        sql = str(statement)
+        if "pg_partitioned_table" in sql:
+            return SimpleNamespace(scalar=lambda: self.partitioned)
+        self.statements.append(sql)
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+
+@pytest.fixture
+def postgresql(monkeypatch):
+    def connect(partitioned: bool) -> RecordingConnection:
+        conn = RecordingConnection(partitioned)
+
+        @asynccontextmanager
+        async def begin():
+            yield conn
+
+        engine = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), begin=begin)
+        monkeypatch.setattr("app.core.database.engine", engine)
+        return conn
+
+    return connect
+
+
+async def test_creates_default_and_monthly_partitions(postgresql):
+    conn = postgresql(partitioned=True)
+    await create_partitions()
+
+    assert "PARTITION OF analysis_reports DEFAULT" in conn.statements[0]
+    assert len(conn.statements) == 1 + _PARTITION_MONTHS
+    assert all("FOR VALUES FROM" in sql for sql in conn.statements[1:])
+
+
+async def test_skips_table_that_is_not_partitioned(postgresql, caplog):
+    conn = postgresql(partitioned=False)
+    with caplog.at_level(logging.WARNING, logger="app.core.database"):
+        await create_partitions()
+
+    assert conn.statements == []
+    assert "analysis_reports is not partitioned" in caplog.text
+
+
+async def test_migration_rebuilds_unpartitioned_table(database):
+    await init_db()
+    async with database.connect() as conn:
+        stale = await conn.run_sync(_stale_tables, {"analysis_reports"})
+    assert [table.name for table in stale] == ["analysis_reports"]